@@ -18,30 +18,42 @@ MIGRATION WORKFLOW:
 
 COMMANDS:
 - alembic revision --autogenerate -m "message"  # Create migration
+  (prefix with ALEMBIC_COMPARE_TYPE=1 to also detect column type changes)
 - alembic upgrade head                           # Apply all migrations
 - alembic downgrade -1                           # Rollback one migration
 - alembic history                                # Show migration history
 - alembic current                                # Show current revision
+
+DATA MIGRATIONS & OFFLINE MODE:
+===============================
+`alembic upgrade head --sql` renders SQL without a database connection,
+so a revision must never read data through op.get_bind() in that mode.
+Guard any data-touching step with context.is_offline_mode():
+
+    from alembic import context, op
+
+    def upgrade() -> None:
+        if context.is_offline_mode():
+            op.execute("-- data backfill skipped in offline mode")
+        else:
+            conn = op.get_bind()
+            ...
 """
 
+import os
+from functools import cache
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config, pool
-
 from alembic import context
 
 # =============================================================================
 # IMPORT APPLICATION COMPONENTS
 # =============================================================================
 # Import settings to get database URL
+# NOTE: Base and the models are imported lazily in get_target_metadata()
+# so commands like `alembic current` don't pay for loading the whole ORM.
 from app.config import get_settings
 
-# Import Base and all models
-# IMPORTANT: Import models package to ensure all models are registered
-# with Base.metadata before autogenerate runs
-from app.database import Base
-from app.models import Book, Author, Genre  # noqa: F401 - needed for autogenerate
-
 # Get application settings
 settings = get_settings()
 
@@ -58,7 +70,20 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+#
+# Read-only CLI commands like `alembic current` skip the INI parsing and
+# handler setup. Everything else keeps logging, including programmatic runs
+# such as command.upgrade(cfg, "head"), which have no cmd_opts.
+# cmd_opts.cmd is (function, positional, kwarg).
+UNLOGGED_COMMANDS = {"current", "history", "heads", "branches", "show"}
+
+
+def _is_unlogged_command() -> bool:
+    cmd = getattr(config.cmd_opts, "cmd", None)
+    return bool(cmd) and cmd[0].__name__ in UNLOGGED_COMMANDS
+
+
+if config.config_file_name is not None and not _is_unlogged_command():
     fileConfig(config.config_file_name)
 
 # =============================================================================
@@ -66,9 +91,41 @@ if config.config_file_name is not None:
 # =============================================================================
 # This is the MetaData object that contains all table definitions.
 # Alembic uses this to compare against the database and generate migrations.
-#
-# By importing all models above, they're registered with Base.metadata.
-target_metadata = Base.metadata
+
+
+@cache
+def get_target_metadata():
+    """
+    Import the models and return the populated MetaData.
+
+    Importing the models package registers every table with Base.metadata
+    before autogenerate runs. It's deferred until a migration function
+    actually needs it, and cached so include_name() doesn't repeat it
+    for every reflected table.
+    """
+    import app.models  # noqa: F401 - registers all models with Base.metadata
+    from app.database import Base
+
+    return Base.metadata
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """
+    Limit autogenerate reflection to tables the models define.
+
+    Tables from other tools sharing the database are never reflected,
+    and alembic skips its own alembic_version table. Columns, indexes and
+    constraints are filtered through their parent table.
+    """
+    if type_ == "table":
+        return name in get_target_metadata().tables
+    return True
+
+
+# Column type comparison makes autogenerate introspect every column's type.
+# Enable it only when generating revisions:
+#   ALEMBIC_COMPARE_TYPE=1 alembic revision --autogenerate -m "message"
+COMPARE_TYPE = os.environ.get("ALEMBIC_COMPARE_TYPE", "0") == "1"
 
 # =============================================================================
 # MIGRATION FUNCTIONS
@@ -91,11 +148,14 @@ def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
-        target_metadata=target_metadata,
+        target_metadata=get_target_metadata(),
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        # Include object type in comparisons (for accurate autogenerate)
-        compare_type=True,
+        # Include object type in comparisons (opt-in, see COMPARE_TYPE)
+        compare_type=COMPARE_TYPE,
+        # Only reflect the default schema and the app's own tables
+        include_schemas=False,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -112,22 +172,63 @@ def run_migrations_online() -> None:
     Usage:
         alembic upgrade head
     """
+    # Only online mode builds an engine; offline SQL generation skips
+    # importing the pool machinery entirely
+    from sqlalchemy import engine_from_config, make_url, pool
+
+    url = make_url(config.get_main_option("sqlalchemy.url"))
+    driver_options = {}
+    if url.get_driver_name() == "psycopg2":
+        # Batch executemany() for bulk data fixups and op.bulk_insert():
+        # psycopg2 sends pages of rows per round-trip instead of one per
+        # row. These arguments, and the libpq connect_args below, only
+        # exist for psycopg2.
+        driver_options.update(
+            executemany_mode="values_plus_batch",
+            executemany_batch_page_size=500,
+            connect_args={
+                # Fail fast if the database is unreachable
+                "connect_timeout": 5,
+                # Never kill a long CREATE INDEX, but give up on a lock that
+                # another session holds for more than 30s
+                "options": "-c statement_timeout=0 -c lock_timeout=30s",
+            },
+        )
+
+    # A single pooled connection is reused for the whole run, so the
+    # TCP/TLS handshake and Postgres auth are paid once, not per step.
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,  # Don't pool connections for migrations
+        poolclass=pool.QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,  # Fresh engine, no stale connections to detect
+        insertmanyvalues_page_size=1000,
+        **driver_options,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            # Compare column types (not just names)
-            compare_type=True,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    try:
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=get_target_metadata(),
+                # Compare column types (opt-in, see COMPARE_TYPE)
+                compare_type=COMPARE_TYPE,
+                # Only reflect the default schema and the app's own tables
+                include_schemas=False,
+                include_name=include_name,
+                # Commit each revision on its own. A single transaction for
+                # the chain wouldn't be atomic anyway: revisions that build
+                # indexes CONCURRENTLY commit midway via autocommit_block().
+                transaction_per_migration=True,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        # Close the pooled connection once migrations are done
+        connectable.dispose()
 
 
 # =============================================================================
@@ -19,6 +19,9 @@ depends_on: Union[str, Sequence[str], None] = ${repr(depends_on)}
 
 
 def upgrade() -> None:
+    # Data-touching steps (op.get_bind() / connection.execute) must be
+    # guarded with `if not context.is_offline_mode():` so that
+    # `alembic upgrade --sql` keeps working. See alembic/env.py.
     ${upgrades if upgrades else "pass"}
 
 
@@ -0,0 +1,50 @@
+"""add_trigram_search_indexes
+
+Revision ID: c7d2e4f6a8b1
+Revises: b5e8f912c3d7
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e4f6a8b1'
+down_revision: Union[str, None] = 'b5e8f912c3d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram GIN indexes let ILIKE '%term%' filters on book titles and
+    # author names use an index instead of scanning the whole table
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_books_title_trgm',
+            'books',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_authors_name_trgm',
+            'authors',
+            ['name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    # The pg_trgm extension is left installed; other objects may use it
+    op.drop_index('ix_authors_name_trgm', table_name='authors')
+    op.drop_index('ix_books_title_trgm', table_name='books')
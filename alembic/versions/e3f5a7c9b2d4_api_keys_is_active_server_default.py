@@ -0,0 +1,41 @@
+"""api_keys_is_active_server_default
+
+Revision ID: e3f5a7c9b2d4
+Revises: c7d2e4f6a8b1
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f5a7c9b2d4'
+down_revision: Union[str, None] = 'c7d2e4f6a8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # api_keys.is_active was created with a client-side default only, so
+    # inserts that bypass SQLAlchemy had to supply it. Setting a column
+    # default is a catalog-only change; existing rows are not touched.
+    op.alter_column(
+        'api_keys',
+        'is_active',
+        existing_type=sa.Boolean(),
+        existing_nullable=False,
+        server_default=sa.text('true'),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'api_keys',
+        'is_active',
+        existing_type=sa.Boolean(),
+        existing_nullable=False,
+        server_default=None,
+    )
@@ -1,5 +1,5 @@
 """
-Application Configuration Module (Phase 1)
+Application Configuration Module
 
 This module uses Pydantic Settings for type-safe configuration management.
 
@@ -13,8 +13,8 @@ WHY Pydantic Settings?
 
 PATTERN: Settings Singleton
 ===========================
-We create a single Settings instance that's cached using @lru_cache.
-This ensures:
+We create a single Settings instance on first use and hand it out
+from get_settings(). This ensures:
 - Configuration is loaded once at startup
 - All parts of the app use the same configuration
 - No repeated file I/O for .env loading
@@ -25,22 +25,65 @@ Usage:
     settings = get_settings()
     print(settings.app_name)
 
-PHASE 1 vs PHASE 2:
-===================
-- Phase 1: Database, security, logging (active)
-- Phase 2: Redis, caching, rate limiting (commented out)
+SINGLE SETTINGS CLASS:
+======================
+All configuration (database, security, logging, Redis, rate limiting,
+OAuth, Elasticsearch, GraphQL) lives in the one Settings class below.
+Optional integrations use empty or local defaults rather than separate
+classes, so the model is built and .env is parsed only once.
 """
 
 import logging
+import re
 import secrets
-from functools import lru_cache
+from enum import StrEnum
+from functools import cached_property
+from typing import Annotated
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BeforeValidator, Field, field_validator
+from pydantic_settings import (
+    BaseSettings,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class Environment(StrEnum):
+    """Deployment environments the app knows about."""
+    DEVELOPMENT = "development"
+    STAGING = "staging"
+    PRODUCTION = "production"
+
+
+class LogLevel(StrEnum):
+    """Python logging level names accepted for log_level."""
+    DEBUG = "DEBUG"
+    INFO = "INFO"
+    WARNING = "WARNING"
+    ERROR = "ERROR"
+    CRITICAL = "CRITICAL"
+
+
+def _lower(v):
+    """Lowercase strings before enum validation (ENVIRONMENT=Production)."""
+    return v.lower() if isinstance(v, str) else v
+
+
+def _upper(v):
+    """Uppercase strings before enum validation (LOG_LEVEL=debug)."""
+    return v.upper() if isinstance(v, str) else v
+
+
+# Placeholder fragments from .env.example that mean "secret not set".
+# One case-insensitive scan instead of lowercasing per indicator.
+_PLACEHOLDER_RE = re.compile(
+    r"replace_with|change-me|your-secret|generate-with",
+    re.IGNORECASE,
+)
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
@@ -83,8 +126,8 @@ class Settings(BaseSettings):
         default=8001,  # Custom port (not default 8000)
         description="Port to bind the server to"
     )
-    environment: str = Field(
-        default="development",
+    environment: Annotated[Environment, BeforeValidator(_lower)] = Field(
+        default=Environment.DEVELOPMENT,
         description="Environment: development, staging, production"
     )
 
@@ -163,6 +206,31 @@ class Settings(BaseSettings):
         default=7,
         description="Refresh token expiration time in days"
     )
+    password_cache_ttl: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds to remember successful password checks in-process (0 = off)"
+    )
+    argon2_time_cost: int = Field(
+        default=2,
+        ge=1,
+        description="Argon2id passes over memory when hashing passwords"
+    )
+    argon2_memory_cost: int = Field(
+        default=65536,
+        ge=8,
+        description="Argon2id memory per password hash, in KiB (65536 = 64 MiB)"
+    )
+    argon2_parallelism: int = Field(
+        default=1,
+        ge=1,
+        description="Argon2id lanes (threads) per password hash"
+    )
+    jwt_cache_ttl: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds to cache decoded JWT payloads in-process (0 = off)"
+    )
 
     # -------------------------------------------------------------------------
     # OAuth Settings (Social Login)
@@ -220,6 +288,11 @@ class Settings(BaseSettings):
         default=True,
         description="Enable API key authentication for write operations"
     )
+    api_key_cache_ttl: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds to cache API key validation results in-process (0 = off)"
+    )
     allowed_origins: str = Field(
         default="http://localhost:3000,http://localhost:8080",
         description="Comma-separated list of allowed CORS origins"
@@ -272,8 +345,8 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------------------
     # Logging Settings
     # -------------------------------------------------------------------------
-    log_level: str = Field(
-        default="INFO",
+    log_level: Annotated[LogLevel, BeforeValidator(_upper)] = Field(
+        default=LogLevel.INFO,
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
     )
 
@@ -289,58 +362,68 @@ class Settings(BaseSettings):
         case_sensitive=False,
         # Extra fields in .env are ignored (no error)
         extra="ignore",
+        # Field reads are plain instance-dict lookups; assignments aren't
+        # re-validated. The model is deliberately not frozen: tests flip
+        # flags like api_key_enabled on the shared instance at runtime.
+        validate_assignment=False,
     )
+    # NOTE: Every field is a scalar (list-like values such as
+    # allowed_origins are plain comma-separated strings), so
+    # pydantic-settings never JSON-decodes an env value. Keep it that way
+    # to avoid the complex-value decode path when adding new settings.
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """
+        Choose where settings are loaded from (highest priority first).
+
+        The app never configures a secrets_dir, so the file-secrets
+        source is dropped rather than consulted for every field on each
+        Settings() construction.
+        """
+        return init_settings, env_settings, dotenv_settings
 
     # -------------------------------------------------------------------------
     # Computed Properties
     # -------------------------------------------------------------------------
-    @property
-    def allowed_origins_list(self) -> list[str]:
+    @cached_property
+    def allowed_origins_list(self) -> tuple[str, ...]:
         """
-        Parse comma-separated CORS origins into a list.
+        Parse comma-separated CORS origins into a tuple.
 
         This is a computed property (not a field) because:
         1. Environment variables are strings
-        2. We need a list for CORS middleware
-        3. Properties are computed on access, not stored
+        2. We need a sequence for CORS middleware
+        3. cached_property parses the string once, on first access,
+           and stores the result on the instance
+
+        A tuple rather than a list since nothing should mutate it after
+        startup. Blank entries (e.g. from a trailing comma) are dropped.
 
         Returns:
-            List of allowed origin URLs
+            Tuple of allowed origin URLs
         """
-        return [origin.strip() for origin in self.allowed_origins.split(",")]
+        return tuple(
+            origin
+            for origin in (o.strip() for o in self.allowed_origins.split(","))
+            if origin
+        )
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
-        """Check if running in production environment."""
-        return self.environment.lower() == "production"
+        """Check if running in production environment (computed once)."""
+        return self.environment == Environment.PRODUCTION
 
     # -------------------------------------------------------------------------
     # Validators
     # -------------------------------------------------------------------------
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        """
-        Validate that log_level is a valid Python logging level.
-
-        @field_validator is a Pydantic v2 feature that validates fields
-        before the model is created. If validation fails, Pydantic raises
-        a ValidationError with a helpful message.
-
-        Args:
-            v: The value to validate
-
-        Returns:
-            The validated value (uppercase)
-
-        Raises:
-            ValueError: If log level is invalid
-        """
-        valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        if v.upper() not in valid_levels:
-            raise ValueError(f"log_level must be one of {valid_levels}")
-        return v.upper()
-
     @field_validator("secret_key")
     @classmethod
     def validate_secret_key(cls, v: str) -> str:
@@ -358,19 +441,9 @@ class Settings(BaseSettings):
         Returns:
             The validated (or auto-generated) secret key
         """
-        placeholder_indicators = [
-            "REPLACE_WITH",
-            "change-me",
-            "your-secret",
-            "generate-with",
-        ]
-
-        needs_generation = not v or len(v) < 32
-        if not needs_generation:
-            for indicator in placeholder_indicators:
-                if indicator.lower() in v.lower():
-                    needs_generation = True
-                    break
+        needs_generation = (
+            not v or len(v) < 32 or _PLACEHOLDER_RE.search(v) is not None
+        )
 
         if needs_generation:
             generated = secrets.token_hex(32)
@@ -383,27 +456,22 @@ class Settings(BaseSettings):
 
         return v
 
-    @field_validator("environment")
-    @classmethod
-    def validate_environment(cls, v: str) -> str:
-        """Validate environment is a known value."""
-        valid_envs = {"development", "staging", "production"}
-        if v.lower() not in valid_envs:
-            raise ValueError(f"environment must be one of {valid_envs}")
-        return v.lower()
+
+# Module-level singleton, built on the first get_settings() call
+_settings: Settings | None = None
 
 
-@lru_cache
 def get_settings() -> Settings:
     """
-    Get cached application settings.
+    Get the application settings singleton.
 
-    WHY @lru_cache?
-    ===============
-    - lru_cache caches the result of this function
-    - First call: Creates Settings instance, loads .env, validates
-    - Subsequent calls: Returns the cached instance
-    - This is Python's way of implementing a singleton pattern
+    WHY a module-level instance?
+    ============================
+    - Settings() is built once, on the first call
+    - Creating it loads .env and runs the validators
+    - Later calls just return that instance (a plain global read and a
+      None check, no lru_cache key hashing on every call)
+    - Importing app.config alone never builds Settings
 
     This means:
     - .env is read only once at startup
@@ -425,6 +493,10 @@ def get_settings() -> Settings:
             print("Debug mode is on!")
 
     Returns:
-        Cached Settings instance
+        Shared Settings instance
     """
-    return Settings()
+    global _settings
+    settings = _settings
+    if settings is None:
+        settings = _settings = Settings()
+    return settings
@@ -30,13 +30,17 @@ We use the "session per request" pattern:
 This is implemented using FastAPI's dependency injection.
 """
 
+import logging
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Get settings instance
 settings = get_settings()
 
@@ -51,6 +55,10 @@ settings = get_settings()
 # - pool_size: Number of connections to keep open permanently
 # - max_overflow: How many extra connections can be created during high load
 # - pool_pre_ping: Test connection health before using (prevents stale connections)
+# - pool_recycle: Replace connections older than this many seconds
+# - pool_timeout: Seconds to wait for a free connection before erroring
+# - pool_use_lifo: Reuse the most recently returned connection, so a few
+#   "hot" connections serve most requests and idle ones can time out
 # - echo: Log all SQL statements (useful for debugging, disable in production)
 
 engine = create_engine(
@@ -58,6 +66,9 @@ engine = create_engine(
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_pre_ping=True,  # Verify connections are alive before using
+    pool_recycle=1800,  # 30 minutes
+    pool_timeout=10,
+    pool_use_lifo=True,
     echo=settings.debug,  # Log SQL in debug mode
 )
 
@@ -65,19 +76,21 @@ engine = create_engine(
 # =============================================================================
 # Session Factory
 # =============================================================================
-# sessionmaker creates a factory for database sessions.
-# Each call to SessionLocal() creates a new session.
+# Each call to SessionLocal() creates a new session. It constructs the
+# Session directly (SQLAlchemy 2.0 style) instead of going through a
+# sessionmaker, which merges its stored kwargs on every call.
 #
 # Parameters:
-# - autocommit=False: We control when to commit (explicit is better than implicit)
 # - autoflush=False: Don't auto-flush before queries (more predictable behavior)
 # - bind=engine: Connect sessions to our database engine
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-)
+
+def SessionLocal() -> Session:
+    """Create a new database session bound to the application engine."""
+    return Session(
+        bind=engine,
+        autoflush=False,
+    )
 
 
 # =============================================================================
@@ -119,17 +132,27 @@ def get_db() -> Generator[Session, None, None]:
     This is a generator function (uses yield) that:
     1. Creates a new database session
     2. Yields it to the route handler
-    3. Closes it when the request ends (in the finally block)
+    3. Commits whatever the handler left pending, or rolls back if the
+       handler raised
+    4. Closes it when the request ends (in the finally block)
 
     WHY Generator with yield?
     ========================
     FastAPI's Depends() works with generators to manage resources:
     - Code before yield: Setup (create session)
     - yield: Provide the session to the route
-    - Code after yield: Cleanup (close session)
+    - Code after yield: Cleanup (commit/rollback, close session)
 
     The finally block ensures cleanup happens even if an exception occurs.
 
+    WHY not `with db.begin(): yield db`?
+    ====================================
+    Handlers call db.commit() and then keep using the session (e.g.
+    db.refresh()). Inside a begin() block that raises "Can't operate on
+    closed transaction", so the transaction is ended explicitly instead.
+    Either way, no request leaves an implicit transaction open on its
+    pooled connection.
+
     Usage in Routes:
         from fastapi import Depends
         from app.database import get_db
@@ -145,6 +168,64 @@ def get_db() -> Generator[Session, None, None]:
         SQLAlchemy Session instance
     """
     db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _reject_flush(session: Session, flush_context, instances) -> None:
+    """before_flush hook for read-only sessions: refuse any ORM write."""
+    raise InvalidRequestError(
+        "This session is read-only (get_db_readonly); use get_db to write"
+    )
+
+
+def _begin_read_only(session: Session, transaction, connection) -> None:
+    """after_begin hook: make the whole transaction read-only on PostgreSQL."""
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def enforce_read_only(db: Session) -> Session:
+    """
+    Make a session reject writes instead of silently dropping them.
+
+    ORM changes fail at flush time on any database. On PostgreSQL every
+    transaction is also started READ ONLY, so raw INSERT/UPDATE/DELETE
+    statements are refused by the server too.
+    """
+    event.listen(db, "before_flush", _reject_flush)
+    event.listen(db, "after_begin", _begin_read_only)
+    return db
+
+
+def get_db_readonly() -> Generator[Session, None, None]:
+    """
+    Database session dependency for routes that only SELECT.
+
+    Same lifecycle as get_db, minus the commit: close() rolls back the
+    read transaction and hands the connection back to the pool. Writes are
+    rejected (see enforce_read_only), so a handler that tries one fails
+    loudly rather than having its change discarded.
+
+    WHY not reuse a thread-local session?
+    =====================================
+    FastAPI runs the setup and teardown of a sync dependency and the sync
+    handler itself as separate threadpool calls, which may land on
+    different worker threads. A session cached per thread could then be
+    handed to two requests at once, and Sessions aren't thread-safe.
+    Creating a Session is cheap; the expensive part (the connection) is
+    already pooled by the engine.
+
+    Yields:
+        SQLAlchemy Session instance
+    """
+    db = enforce_read_only(SessionLocal())
     try:
         yield db
     finally:
@@ -165,13 +246,47 @@ def create_tables() -> None:
     WARNING: In production, use Alembic migrations instead!
     This function doesn't track schema changes or allow rollbacks.
 
+    The models are imported first, so Base.metadata knows every table
+    even when the caller hasn't imported app.models itself.
+
     Usage:
         from app.database import create_tables
         create_tables()
     """
+    import app.models  # noqa: F401 - registers all models with Base.metadata
+
     Base.metadata.create_all(bind=engine)
 
 
+def warm_up_pool() -> bool:
+    """
+    Open the pool's permanent connections ahead of the first request.
+
+    Called from the app's lifespan startup so the first requests don't pay
+    for TCP/TLS setup and Postgres authentication. Each connection runs a
+    trivial query and is then returned to the pool. Also imports the models
+    so Base.metadata and the mappers are fully configured up front.
+
+    Returns:
+        True if the database was reachable, False otherwise
+    """
+    import app.models  # noqa: F401 - registers all models with Base.metadata
+
+    connections = []
+    try:
+        for _ in range(settings.db_pool_size):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+        return True
+    except SQLAlchemyError as e:
+        logger.warning(f"Database warm-up failed: {e}")
+        return False
+    finally:
+        for connection in connections:
+            connection.close()
+
+
 def drop_tables() -> None:
     """
     Drop all database tables.
@@ -182,4 +297,6 @@ def drop_tables() -> None:
 
     NEVER use in production!
     """
+    import app.models  # noqa: F401 - registers all models with Base.metadata
+
     Base.metadata.drop_all(bind=engine)
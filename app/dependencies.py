@@ -19,18 +19,20 @@ Common Dependency Patterns:
 - Caching
 """
 
-from typing import TYPE_CHECKING, Annotated
+from dataclasses import dataclass
+from functools import partial
+from typing import Annotated
 
 from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.config import get_settings
-from app.database import get_db
-
-if TYPE_CHECKING:
-    from app.models.user import User
+from app.database import get_db, get_db_readonly
+from app.models import Book, User
+from app.services.auth import is_api_key_valid
+from app.services.security import verify_token_type
 
 settings = get_settings()
 
@@ -48,6 +50,9 @@ settings = get_settings()
 
 DbSession = Annotated[Session, Depends(get_db)]
 
+# For routes that only read: the session is never committed
+ReadOnlyDbSession = Annotated[Session, Depends(get_db_readonly)]
+
 
 # =============================================================================
 # Pagination Parameters
@@ -59,7 +64,7 @@ class PaginationParams:
     This class-based dependency captures pagination logic:
     - page: Which page to return (1-indexed for user-friendliness)
     - per_page: How many items per page
-    - skip: Calculated offset for database query
+    - skip: Offset for database query (computed once in __init__)
 
     Usage in route:
         @router.get("/books/")
@@ -70,6 +75,8 @@ class PaginationParams:
             books = db.query(Book).offset(pagination.skip).limit(pagination.per_page).all()
     """
 
+    __slots__ = ("page", "per_page", "skip")
+
     def __init__(
         self,
         page: int = Query(
@@ -92,27 +99,19 @@ class PaginationParams:
         Query() is used because these come from URL query parameters:
             GET /books/?page=2&per_page=20
 
+        skip is the number of records to skip. Database OFFSET uses
+        0-based indexing, but users expect 1-based pages:
+        Page 1 → skip 0 items
+        Page 2 → skip per_page items
+        Page 3 → skip 2 * per_page items
+
         Args:
             page: Page number (starts at 1 for user-friendliness)
             per_page: Number of items per page
         """
         self.page = page
         self.per_page = per_page
-
-    @property
-    def skip(self) -> int:
-        """
-        Calculate the number of records to skip.
-
-        Database OFFSET uses 0-based indexing, but users expect 1-based pages.
-        Page 1 → skip 0 items
-        Page 2 → skip per_page items
-        Page 3 → skip 2 * per_page items
-
-        Returns:
-            Number of records to skip in database query
-        """
-        return (self.page - 1) * self.per_page
+        self.skip = (page - 1) * per_page
 
 
 # Type alias for cleaner route signatures
@@ -122,35 +121,41 @@ Pagination = Annotated[PaginationParams, Depends()]
 # =============================================================================
 # Common Query Parameters
 # =============================================================================
-def get_search_query(
-    q: str | None = Query(
-        default=None,
+# Common search query parameter, read from ?q=...
+#
+# The Query(...) metadata lives directly in the Annotated alias, so there's
+# no wrapper dependency for FastAPI to call on every request. The default
+# goes on the route parameter (Annotated Query() can't carry one).
+#
+# Usage:
+#     @router.get("/books/")
+#     def search_books(search: SearchQuery = None):
+#         if search:
+#             # Filter books by search term
+
+SearchQuery = Annotated[
+    str | None,
+    Query(
+        alias="q",
         min_length=1,
         max_length=100,
         description="Search query string",
         examples=["orwell", "science fiction"],
     ),
-) -> str | None:
-    """
-    Common search query parameter.
-
-    Returns None if no search query provided, otherwise the search string.
-
-    Usage:
-        @router.get("/books/")
-        def search_books(search: str | None = Depends(get_search_query)):
-            if search:
-                # Filter books by search term
-    """
-    return q
-
-
-SearchQuery = Annotated[str | None, Depends(get_search_query)]
+]
 
 
 # =============================================================================
 # Book Search Filters
 # =============================================================================
+# Shared Query(...) templates for the optional filter parameters, so each
+# filter only spells out its own description and examples.
+_TextQuery = partial(Query, min_length=1, max_length=100)
+_YearQuery = partial(Query, ge=1000, le=9999)
+_PriceQuery = partial(Query, ge=0)
+
+
+@dataclass(slots=True, frozen=True)
 class BookSearchParams:
     """
     Search and filter parameters for book endpoints.
@@ -163,89 +168,70 @@ class BookSearchParams:
 
     All parameters are optional and can be combined.
 
+    A frozen, slotted dataclass: FastAPI reads the Query() metadata from
+    the Annotated field types of the generated __init__, instances carry
+    no __dict__, and filters are hashable so they can be used as cache
+    keys. Constructing it directly (BookSearchParams(title="x")) gives
+    plain None defaults.
+
     Usage:
         GET /api/books/?title=orwell&genre_id=1&min_year=1940&max_year=1960
         GET /api/books/search/?q=dystopian&min_price=10&max_price=20
     """
 
-    def __init__(
-        self,
-        q: str | None = Query(
-            default=None,
-            min_length=1,
-            max_length=100,
-            description="Search query (searches title and author name)",
-            examples=["orwell", "dystopian"],
-        ),
-        title: str | None = Query(
-            default=None,
-            min_length=1,
-            max_length=100,
-            description="Filter by title (partial match, case-insensitive)",
-            examples=["1984", "pride"],
-        ),
-        author: str | None = Query(
-            default=None,
-            min_length=1,
-            max_length=100,
-            description="Filter by author name (partial match, case-insensitive)",
-            examples=["orwell", "austen"],
-        ),
-        genre_id: int | None = Query(
-            default=None,
-            ge=1,
-            description="Filter by genre ID",
-            examples=[1, 2],
-        ),
-        min_year: int | None = Query(
-            default=None,
-            ge=1000,
-            le=9999,
-            description="Minimum publication year",
-            examples=[1900, 1950],
-        ),
-        max_year: int | None = Query(
-            default=None,
-            ge=1000,
-            le=9999,
-            description="Maximum publication year",
-            examples=[2000, 2024],
-        ),
-        min_price: float | None = Query(
-            default=None,
-            ge=0,
-            description="Minimum price",
-            examples=[0, 10.00],
-        ),
-        max_price: float | None = Query(
-            default=None,
-            ge=0,
-            description="Maximum price",
-            examples=[20.00, 50.00],
-        ),
-    ) -> None:
-        self.q = q
-        self.title = title
-        self.author = author
-        self.genre_id = genre_id
-        self.min_year = min_year
-        self.max_year = max_year
-        self.min_price = min_price
-        self.max_price = max_price
+    q: Annotated[str | None, _TextQuery(
+        description="Search query (searches title and author name)",
+        examples=["orwell", "dystopian"],
+    )] = None
+    title: Annotated[str | None, _TextQuery(
+        description="Filter by title (partial match, case-insensitive)",
+        examples=["1984", "pride"],
+    )] = None
+    author: Annotated[str | None, _TextQuery(
+        description="Filter by author name (partial match, case-insensitive)",
+        examples=["orwell", "austen"],
+    )] = None
+    genre_id: Annotated[int | None, Query(
+        ge=1,
+        description="Filter by genre ID",
+        examples=[1, 2],
+    )] = None
+    min_year: Annotated[int | None, _YearQuery(
+        description="Minimum publication year",
+        examples=[1900, 1950],
+    )] = None
+    max_year: Annotated[int | None, _YearQuery(
+        description="Maximum publication year",
+        examples=[2000, 2024],
+    )] = None
+    min_price: Annotated[float | None, _PriceQuery(
+        description="Minimum price",
+        examples=[0, 10.00],
+    )] = None
+    max_price: Annotated[float | None, _PriceQuery(
+        description="Maximum price",
+        examples=[20.00, 50.00],
+    )] = None
 
     @property
     def has_filters(self) -> bool:
-        """Check if any filters are applied."""
-        return any([
-            self.q,
-            self.title,
-            self.author,
-            self.genre_id,
-            self.min_year,
-            self.max_year,
-            self.min_price,
-            self.max_price,
-        ])
+        """
+        Check if any filters are applied.
+
+        Short-circuits on the first filter that is set. Numeric filters
+        are compared against None so a price of 0 still counts, matching
+        apply_book_filters().
+        """
+        return bool(
+            self.q
+            or self.title
+            or self.author
+            or self.genre_id is not None
+            or self.min_year is not None
+            or self.max_year is not None
+            or self.min_price is not None
+            or self.max_price is not None
+        )
 
 
 # Type alias for cleaner route signatures
@@ -275,9 +261,6 @@ def get_api_key(
     Raises:
         HTTPException: 401 if authentication fails
     """
-    # Import here to avoid circular imports
-    from app.services.auth import validate_api_key
-
     # Check if authentication is disabled (for development)
     if not settings.api_key_enabled:
         return None
@@ -290,9 +273,8 @@ def get_api_key(
             headers={"WWW-Authenticate": "ApiKey"},
         )
 
-    # Validate the key
-    api_key = validate_api_key(db, x_api_key)
-    if api_key is None:
+    # Validate the key (cached in-process, see app.services.auth)
+    if not is_api_key_valid(db, x_api_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired API key.",
@@ -318,14 +300,12 @@ def get_optional_api_key(
 
     Returns:
         The API key string if provided and valid, None otherwise
+        (always None while API key auth is disabled, like get_api_key)
     """
-    from app.services.auth import validate_api_key
-
-    if not x_api_key:
+    if not settings.api_key_enabled or not x_api_key:
         return None
 
-    api_key = validate_api_key(db, x_api_key)
-    return x_api_key if api_key else None
+    return x_api_key if is_api_key_valid(db, x_api_key) else None
 
 
 # Type aliases for cleaner route signatures
@@ -354,6 +334,68 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
 )
 
 
+def _credentials_exception() -> HTTPException:
+    """
+    Build the 401 raised for a bad or unknown bearer token.
+
+    Built on demand rather than up front, so successful requests don't
+    allocate an exception they never raise. Not a shared module-level
+    instance either: raising one object from concurrent requests would
+    race on its __traceback__ and keep old request frames alive.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _resolve_user(token: str, db: Session) -> User:
+    """
+    Decode an access token and load its user, or raise 401.
+
+    Backs get_current_user, the one dependency every authenticated route
+    resolves the user through.
+    """
+    # Verify and decode the token
+    payload = verify_token_type(token, "access")
+    if payload is None:
+        raise _credentials_exception()
+
+    # Extract user identifier from token
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise _credentials_exception()
+
+    # Look up user in database
+    user = db.get(User, int(user_id))
+
+    if user is None:
+        raise _credentials_exception()
+
+    return user
+
+
+def _ensure_active(user: User) -> User:
+    """Raise 403 if the user account is inactive."""
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive",
+        )
+    return user
+
+
+def _ensure_superuser(user: User) -> User:
+    """Raise 403 if the user lacks superuser privileges."""
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superuser privileges required",
+        )
+    return user
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
@@ -377,33 +419,7 @@ def get_current_user(
     Raises:
         HTTPException: 401 if token is invalid or user not found
     """
-    from app.models.user import User
-    from app.services.security import verify_token_type
-
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    # Verify and decode the token
-    payload = verify_token_type(token, "access")
-    if payload is None:
-        raise credentials_exception
-
-    # Extract user identifier from token
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-
-    # Look up user in database
-    stmt = select(User).where(User.id == int(user_id))
-    user = db.execute(stmt).scalar_one_or_none()
-
-    if user is None:
-        raise credentials_exception
-
-    return user
+    return _resolve_user(token, db)
 
 
 def get_current_active_user(
@@ -424,16 +440,11 @@ def get_current_active_user(
     Raises:
         HTTPException: 403 if user is inactive
     """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account is inactive",
-        )
-    return current_user
+    return _ensure_active(current_user)
 
 
 def get_current_superuser(
-    current_user=Depends(get_current_active_user),
+    current_user=Depends(get_current_user),
 ):
     """
     Verify the current user has superuser (admin) privileges.
@@ -443,21 +454,22 @@ def get_current_superuser(
     - System configuration
     - Moderation actions
 
+    Depends on get_current_user directly (not get_current_active_user) and
+    applies both checks itself, so an admin request resolves two dependency
+    nodes instead of three. get_current_user stays the one shared
+    sub-dependency: FastAPI caches it per request, and overriding it in
+    app.dependency_overrides affects every protected route.
+
     Args:
-        current_user: Active user from get_current_active_user
+        current_user: User from get_current_user
 
     Returns:
-        User object if superuser
+        User object if active and superuser
 
     Raises:
-        HTTPException: 403 if user is not a superuser
+        HTTPException: 403 if user is inactive or not a superuser
     """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Superuser privileges required",
-        )
-    return current_user
+    return _ensure_superuser(_ensure_active(current_user))
 
 
 def get_optional_current_user(
@@ -483,9 +495,6 @@ def get_optional_current_user(
     if not token:
         return None
 
-    from app.models.user import User
-    from app.services.security import verify_token_type
-
     payload = verify_token_type(token, "access")
     if payload is None:
         return None
@@ -494,8 +503,7 @@ def get_optional_current_user(
     if user_id is None:
         return None
 
-    stmt = select(User).where(User.id == int(user_id))
-    user = db.execute(stmt).scalar_one_or_none()
+    user = db.get(User, int(user_id))
 
     return user
 
@@ -528,10 +536,6 @@ def get_book_or_404(db: Session, book_id: int):
     Raises:
         HTTPException: 404 if book not found
     """
-    from sqlalchemy.orm import selectinload
-
-    from app.models import Book
-
     stmt = (
         select(Book)
         .options(selectinload(Book.authors), selectinload(Book.genres))
@@ -561,10 +565,7 @@ def get_user_or_404(db: Session, user_id: int):
     Raises:
         HTTPException: 404 if user not found
     """
-    from app.models.user import User
-
-    stmt = select(User).where(User.id == user_id)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = db.get(User, user_id)
 
     if user is None:
         raise HTTPException(
@@ -33,6 +33,7 @@ import strawberry
 from strawberry.fastapi import GraphQLRouter
 
 from app.graphql.context import get_context
+from app.graphql.extensions import UnitOfWorkExtension
 from app.graphql.mutations import Mutation
 from app.graphql.queries import Query
 
@@ -40,6 +41,7 @@ from app.graphql.queries import Query
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
+    extensions=[UnitOfWorkExtension],
 )
 
 
@@ -10,18 +10,22 @@ The context is created fresh for each GraphQL request and passed
 to all resolvers via the `info` parameter.
 """
 
-from typing import TYPE_CHECKING
+import asyncio
+from collections.abc import Callable
+from functools import cached_property
 
 from fastapi import Depends, Request
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from strawberry.fastapi import BaseContext
 
 from app.database import get_db
+from app.graphql.types.author import AuthorType
+from app.graphql.types.genre import GenreType
+from app.models import Book, User
 from app.services.security import verify_token_type
 
-if TYPE_CHECKING:
-    from app.models.user import User
+BEARER_PREFIX = "Bearer "
 
 
 class GraphQLContext(BaseContext):
@@ -35,9 +39,80 @@ class GraphQLContext(BaseContext):
         user: Currently authenticated user (None if not authenticated)
     """
 
-    def __init__(self, db: Session, user: "User | None" = None):
+    def __init__(self, db: Session, token: str | None = None):
         self.db = db
-        self.user = user
+        self._token = token
+        self._books: dict[int, Book] = {}
+        # GraphQL objects already built for this request, keyed by ID, so
+        # an author or genre shared by many books is converted only once
+        self.author_types: dict[int, AuthorType] = {}
+        self.genre_types: dict[int, GenreType] = {}
+        self._after_commit: list[tuple[Callable[..., None], tuple]] = []
+        # Held by async resolvers while they run session work in the
+        # threadpool, since a Session must not be used by two threads at once
+        self.db_lock = asyncio.Lock()
+
+    @cached_property
+    def user(self) -> "User | None":
+        """
+        The user for the request's access token, resolved on first use.
+
+        Public queries never touch it, so they skip the JWT check and the
+        user lookup entirely; every later access in the same request (e.g.
+        several mutations calling require_auth) reuses the first result.
+        """
+        return get_user_from_token(self.db, self._token)
+
+    def after_commit(self, func: Callable[..., None], *args) -> None:
+        """
+        Run func(*args) once the operation's transaction has committed.
+
+        Used for cache invalidation: evicting before the commit would let a
+        concurrent request refill the cache from the old rows, and after a
+        rollback there is nothing to evict. Called by UnitOfWorkExtension.
+        """
+        self._after_commit.append((func, args))
+
+    def run_after_commit(self) -> None:
+        """Run and clear the callbacks registered with after_commit()."""
+        callbacks, self._after_commit = self._after_commit, []
+        for func, args in callbacks:
+            func(*args)
+
+    def discard_after_commit(self) -> None:
+        """Drop the registered callbacks (the transaction was rolled back)."""
+        self._after_commit.clear()
+
+    def load_books(self, ids: list[int]) -> dict[int, Book]:
+        """
+        Load books (with authors and genres) by ID, batched per request.
+
+        Works like a DataLoader for our sync resolvers: every ID not seen
+        earlier in this request is fetched in a single `WHERE id IN (...)`
+        query instead of one SELECT per book, and results are remembered
+        until the request ends.
+
+        Args:
+            ids: Book IDs to load
+
+        Returns:
+            Mapping of ID to Book for the IDs that exist
+        """
+        missing = [book_id for book_id in ids if book_id not in self._books]
+        if missing:
+            stmt = (
+                select(Book)
+                .options(selectinload(Book.authors), selectinload(Book.genres))
+                .where(Book.id.in_(missing))
+            )
+            for book in self.db.execute(stmt).scalars():
+                self._books[book.id] = book
+
+        return {
+            book_id: self._books[book_id]
+            for book_id in ids
+            if book_id in self._books
+        }
 
 
 def get_user_from_token(db: Session, token: str | None) -> "User | None":
@@ -54,8 +129,6 @@ def get_user_from_token(db: Session, token: str | None) -> "User | None":
     if not token:
         return None
 
-    from app.models.user import User
-
     # Verify token and extract payload
     payload = verify_token_type(token, "access")
     if payload is None:
@@ -67,8 +140,7 @@ def get_user_from_token(db: Session, token: str | None) -> "User | None":
         return None
 
     # Fetch user from database
-    stmt = select(User).where(User.id == int(user_id))
-    user = db.execute(stmt).scalar_one_or_none()
+    user = db.get(User, int(user_id))
 
     # Check if user is active
     if user and not user.is_active:
@@ -77,7 +149,7 @@ def get_user_from_token(db: Session, token: str | None) -> "User | None":
     return user
 
 
-async def get_context(
+def get_context(
     request: Request,
     db: Session = Depends(get_db),
 ) -> GraphQLContext:
@@ -86,22 +158,23 @@ async def get_context(
 
     This function is called by Strawberry for every GraphQL request.
     It extracts the JWT token from the Authorization header and
-    uses the injected database session.
+    uses the injected database session. The token is only checked when a
+    resolver first reads context.user.
+
+    The session comes from get_db, so FastAPI closes it when the request
+    ends.
 
     Args:
         request: FastAPI request object
         db: Database session from dependency injection
 
     Returns:
-        GraphQLContext with db session and optional user
+        GraphQLContext with db session and optional token
     """
     # Extract token from Authorization header
     auth_header = request.headers.get("Authorization", "")
-    token = None
-    if auth_header.startswith("Bearer "):
-        token = auth_header[7:]  # Remove 'Bearer ' prefix
-
-    # Get user from token (if valid)
-    user = get_user_from_token(db, token)
+    token = auth_header.removeprefix(BEARER_PREFIX)
+    if token == auth_header:
+        token = None  # No 'Bearer ' prefix
 
-    return GraphQLContext(db=db, user=user)
+    return GraphQLContext(db=db, token=token)
@@ -0,0 +1,44 @@
+"""
+GraphQL Schema Extensions
+
+Hooks that run around every GraphQL operation.
+
+Transaction per Operation
+=========================
+Mutation resolvers only flush their changes; UnitOfWorkExtension commits
+them once after the whole operation has run, so a request with several
+mutations pays for one COMMIT instead of one per mutation.
+
+If any resolver raised, everything is rolled back instead. Every mutation
+returns a non-null type, so an error already makes `data` null for the
+whole operation; rolling back keeps the database in line with what the
+client was told.
+
+Work that must only happen once the data is committed (cache eviction)
+is queued with GraphQLContext.after_commit() and run after the COMMIT,
+or dropped on rollback.
+"""
+
+from collections.abc import Iterator
+
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+
+class UnitOfWorkExtension(SchemaExtension):
+    """Commit a mutation operation's session once, or roll it back on error."""
+
+    def on_execute(self) -> Iterator[None]:
+        yield
+
+        execution_context = self.execution_context
+        if execution_context.operation_type is not OperationType.MUTATION:
+            return
+
+        context = execution_context.context
+        if execution_context.errors:
+            context.db.rollback()
+            context.discard_after_commit()
+        else:
+            context.db.commit()
+            context.run_after_commit()
@@ -5,11 +5,12 @@ Defines all write operations (mutations) for the GraphQL API.
 Mutations require authentication for most operations.
 """
 
-from datetime import UTC, datetime
+from typing import TypeVar
 
 import strawberry
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, raiseload, selectinload
 from strawberry.types import Info
 
 from app.graphql.context import GraphQLContext
@@ -27,13 +28,57 @@ from app.graphql.types.user import AuthPayload, LoginInput, RegisterInput, UserT
 from app.models import Author, Book, Genre
 from app.models.review import Review
 from app.models.user import AuthProvider, User
+from app.services.cache import (
+    invalidate_author_cache,
+    invalidate_book_cache,
+    invalidate_genre_cache,
+)
 from app.services.security import (
+    DUMMY_PASSWORD_HASH,
     create_access_token,
     create_refresh_token,
     hash_password,
+    password_needs_rehash,
     verify_password,
 )
 
+ModelT = TypeVar("ModelT", Author, Genre)
+
+_VALID_RATINGS: frozenset[int] = frozenset(range(1, 6))
+
+# =============================================================================
+# Prebuilt statements
+# =============================================================================
+# These lookups have the same shape on every call, so they're built once at
+# import time with bind parameters and executed with the values, e.g.
+# db.execute(_USER_BY_EMAIL, {"email": ...}). SQLAlchemy still finds the
+# compiled SQL in its cache, but skips rebuilding the expression tree first.
+
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+_EMAIL_TAKEN = select(User.id).where(User.email == bindparam("email")).limit(1)
+
+_GENRE_NAME_TAKEN = select(Genre.id).where(Genre.name == bindparam("name")).limit(1)
+
+_BOOK_EXISTS = select(Book.id).where(Book.id == bindparam("id"))
+
+_BOOK_WITH_RELATIONS = (
+    select(Book)
+    .options(
+        selectinload(Book.authors),
+        selectinload(Book.genres),
+        raiseload("*"),
+    )
+    .where(Book.id == bindparam("id"))
+)
+
+_REVIEW_WITH_USER = (
+    select(Review)
+    .options(selectinload(Review.user), raiseload("*"))
+    .where(Review.id == bindparam("id"))
+)
+
+
 # =============================================================================
 # Error classes for GraphQL
 # =============================================================================
@@ -63,6 +108,20 @@ class ValidationError(Exception):
     pass
 
 
+def _load_all_by_id(db: Session, model: type[ModelT], ids: list[int], label: str) -> list[ModelT]:
+    """
+    Load rows by ID in one query, raising NotFoundError if any are missing.
+
+    Repeated IDs are only counted once, so [1, 1] matches a single row
+    instead of being reported as missing.
+    """
+    unique_ids = set(ids)
+    rows = db.execute(select(model).where(model.id.in_(unique_ids))).scalars().all()
+    if len(rows) != len(unique_ids):
+        raise NotFoundError(f"One or more {label} not found")
+    return list(rows)
+
+
 def require_auth(info: Info[GraphQLContext, None]) -> User:
     """Helper to require authentication and return the user."""
     user = info.context.user
@@ -102,14 +161,16 @@ class Mutation:
         db = info.context.db
 
         # Find user by email
-        stmt = select(User).where(User.email == input.email)
-        user = db.execute(stmt).scalar_one_or_none()
-
-        # Verify credentials
-        if not user or not user.hashed_password:
-            raise AuthenticationError("Invalid email or password")
-
-        if not verify_password(input.password, user.hashed_password):
+        user = db.execute(_USER_BY_EMAIL, {"email": input.email}).scalar_one_or_none()
+
+        # Verify credentials. The hash check runs even when there's no
+        # password to compare against, so unknown emails aren't faster.
+        has_password = bool(user and user.hashed_password)
+        password_ok = verify_password(
+            input.password,
+            user.hashed_password if has_password else DUMMY_PASSWORD_HASH,
+        )
+        if not has_password or not password_ok:
             raise AuthenticationError("Invalid email or password")
 
         if not user.is_active:
@@ -120,9 +181,13 @@ class Mutation:
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token(token_data)
 
-        # Update last login
-        user.last_login_at = datetime.now(UTC)
-        db.commit()
+        # Upgrade bcrypt (or outdated argon2) hashes while we have the password
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = hash_password(input.password)
+
+        # Update last login (set by the database clock in the UPDATE)
+        user.last_login_at = func.now()
+        db.flush()
 
         return AuthPayload(
             access_token=access_token,
@@ -152,11 +217,6 @@ class Mutation:
         """
         db = info.context.db
 
-        # Check if email already exists
-        stmt = select(User).where(User.email == input.email)
-        if db.execute(stmt).scalar_one_or_none():
-            raise ValidationError("Email already registered")
-
         # Create user
         user = User(
             email=input.email,
@@ -168,9 +228,16 @@ class Mutation:
             is_verified=False,
         )
 
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        # The unique constraints reject a taken email (or derived username)
+        # on insert, so there's no pre-check SELECT. The email is only looked
+        # up on that failure path, to pick the right message.
+        try:
+            with db.begin_nested():
+                db.add(user)
+        except IntegrityError:
+            if db.execute(_EMAIL_TAKEN, {"email": input.email}).first() is not None:
+                raise ValidationError("Email already registered") from None
+            raise ValidationError(f"Username '{user.username}' is already taken") from None
 
         # Create tokens
         token_data = {"sub": str(user.id)}
@@ -222,31 +289,19 @@ class Mutation:
 
         # Add authors
         if input.author_ids:
-            stmt = select(Author).where(Author.id.in_(input.author_ids))
-            authors = db.execute(stmt).scalars().all()
-            if len(authors) != len(input.author_ids):
-                raise NotFoundError("One or more authors not found")
-            book.authors = list(authors)
+            book.authors = _load_all_by_id(db, Author, input.author_ids, "authors")
 
         # Add genres
         if input.genre_ids:
-            stmt = select(Genre).where(Genre.id.in_(input.genre_ids))
-            genres = db.execute(stmt).scalars().all()
-            if len(genres) != len(input.genre_ids):
-                raise NotFoundError("One or more genres not found")
-            book.genres = list(genres)
+            book.genres = _load_all_by_id(db, Genre, input.genre_ids, "genres")
 
         db.add(book)
-        db.commit()
-        db.refresh(book)
-
-        # Reload with relationships
-        stmt = (
-            select(Book)
-            .options(selectinload(Book.authors), selectinload(Book.genres))
-            .where(Book.id == book.id)
-        )
-        book = db.execute(stmt).scalar_one()
+        db.flush()
+        info.context.after_commit(invalidate_book_cache)
+
+        # Reload with relationships. This one query also fills in the
+        # server-generated columns, so no separate db.refresh() is needed.
+        book = db.execute(_BOOK_WITH_RELATIONS, {"id": book.id}).scalar_one()
 
         return book_to_graphql(book)
 
@@ -266,12 +321,7 @@ class Mutation:
         db = info.context.db
 
         # Find book
-        stmt = (
-            select(Book)
-            .options(selectinload(Book.authors), selectinload(Book.genres))
-            .where(Book.id == id)
-        )
-        book = db.execute(stmt).scalar_one_or_none()
+        book = db.execute(_BOOK_WITH_RELATIONS, {"id": id}).scalar_one_or_none()
 
         if book is None:
             raise NotFoundError(f"Book with ID {id} not found")
@@ -292,22 +342,18 @@ class Mutation:
 
         # Update authors
         if input.author_ids is not None:
-            stmt = select(Author).where(Author.id.in_(input.author_ids))
-            authors = db.execute(stmt).scalars().all()
-            if len(authors) != len(input.author_ids):
-                raise NotFoundError("One or more authors not found")
-            book.authors = list(authors)
+            book.authors = _load_all_by_id(db, Author, input.author_ids, "authors")
 
         # Update genres
         if input.genre_ids is not None:
-            stmt = select(Genre).where(Genre.id.in_(input.genre_ids))
-            genres = db.execute(stmt).scalars().all()
-            if len(genres) != len(input.genre_ids):
-                raise NotFoundError("One or more genres not found")
-            book.genres = list(genres)
+            book.genres = _load_all_by_id(db, Genre, input.genre_ids, "genres")
 
-        db.commit()
-        db.refresh(book)
+        # Skip the UPDATE and the reload when the input changed nothing
+        # (all fields omitted, or set to their current values)
+        if db.is_modified(book):
+            db.flush()
+            db.refresh(book)
+            info.context.after_commit(invalidate_book_cache, id)
 
         return book_to_graphql(book)
 
@@ -326,14 +372,14 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        stmt = select(Book).where(Book.id == id)
-        book = db.execute(stmt).scalar_one_or_none()
+        book = db.get(Book, id)
 
         if book is None:
             raise NotFoundError(f"Book with ID {id} not found")
 
         db.delete(book)
-        db.commit()
+        db.flush()
+        info.context.after_commit(invalidate_book_cache, id)
 
         return True
 
@@ -360,9 +406,11 @@ class Mutation:
             bio=input.bio,
         )
 
+        # The INSERT fetches id and the server-side timestamps with
+        # RETURNING, so there's nothing left for a db.refresh() to load.
         db.add(author)
-        db.commit()
-        db.refresh(author)
+        db.flush()
+        info.context.after_commit(invalidate_author_cache)
 
         return author_to_graphql(author)
 
@@ -381,8 +429,7 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        stmt = select(Author).where(Author.id == id)
-        author = db.execute(stmt).scalar_one_or_none()
+        author = db.get(Author, id)
 
         if author is None:
             raise NotFoundError(f"Author with ID {id} not found")
@@ -393,8 +440,10 @@ class Mutation:
         if input.bio is not None:
             author.bio = input.bio
 
-        db.commit()
-        db.refresh(author)
+        if db.is_modified(author):
+            db.flush()
+            db.refresh(author)
+            info.context.after_commit(invalidate_author_cache, id)
 
         return author_to_graphql(author)
 
@@ -413,14 +462,14 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        stmt = select(Author).where(Author.id == id)
-        author = db.execute(stmt).scalar_one_or_none()
+        author = db.get(Author, id)
 
         if author is None:
             raise NotFoundError(f"Author with ID {id} not found")
 
         db.delete(author)
-        db.commit()
+        db.flush()
+        info.context.after_commit(invalidate_author_cache, id)
 
         return True
 
@@ -442,19 +491,21 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        # Check for duplicate name
-        stmt = select(Genre).where(Genre.name == input.name)
-        if db.execute(stmt).scalar_one_or_none():
-            raise ValidationError(f"Genre '{input.name}' already exists")
-
         genre = Genre(
             name=input.name,
             description=input.description,
         )
 
-        db.add(genre)
-        db.commit()
-        db.refresh(genre)
+        # No pre-check SELECT for the name: the unique constraint rejects a
+        # duplicate on insert. The savepoint undoes just the failed INSERT,
+        # so the session stays usable.
+        try:
+            with db.begin_nested():
+                db.add(genre)
+        except IntegrityError:
+            raise ValidationError(f"Genre '{input.name}' already exists") from None
+
+        info.context.after_commit(invalidate_genre_cache)
 
         return genre_to_graphql(genre)
 
@@ -473,24 +524,24 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        stmt = select(Genre).where(Genre.id == id)
-        genre = db.execute(stmt).scalar_one_or_none()
+        genre = db.get(Genre, id)
 
         if genre is None:
             raise NotFoundError(f"Genre with ID {id} not found")
 
         # Check for duplicate name (if changing)
         if input.name and input.name != genre.name:
-            stmt = select(Genre).where(Genre.name == input.name)
-            if db.execute(stmt).scalar_one_or_none():
+            if db.execute(_GENRE_NAME_TAKEN, {"name": input.name}).first() is not None:
                 raise ValidationError(f"Genre '{input.name}' already exists")
             genre.name = input.name
 
         if input.description is not None:
             genre.description = input.description
 
-        db.commit()
-        db.refresh(genre)
+        if db.is_modified(genre):
+            db.flush()
+            db.refresh(genre)
+            info.context.after_commit(invalidate_genre_cache, id)
 
         return genre_to_graphql(genre)
 
@@ -509,14 +560,14 @@ class Mutation:
         require_auth(info)
         db = info.context.db
 
-        stmt = select(Genre).where(Genre.id == id)
-        genre = db.execute(stmt).scalar_one_or_none()
+        genre = db.get(Genre, id)
 
         if genre is None:
             raise NotFoundError(f"Genre with ID {id} not found")
 
         db.delete(genre)
-        db.commit()
+        db.flush()
+        info.context.after_commit(invalidate_genre_cache, id)
 
         return True
 
@@ -539,43 +590,36 @@ class Mutation:
         user = require_auth(info)
         db = info.context.db
 
-        # Check book exists
-        stmt = select(Book).where(Book.id == book_id)
-        book = db.execute(stmt).scalar_one_or_none()
-        if book is None:
-            raise NotFoundError(f"Book with ID {book_id} not found")
-
-        # Check for existing review
-        stmt = select(Review).where(
-            Review.book_id == book_id,
-            Review.user_id == user.id,
-        )
-        if db.execute(stmt).scalar_one_or_none():
-            raise ValidationError("You have already reviewed this book")
-
-        # Validate rating
-        if input.rating < 1 or input.rating > 5:
+        # Validate rating before touching the database
+        if input.rating not in _VALID_RATINGS:
             raise ValidationError("Rating must be between 1 and 5")
 
-        review = Review(
-            book_id=book_id,
-            user_id=user.id,
-            rating=input.rating,
-            title=input.title,
-            content=input.content,
-        )
-
-        db.add(review)
-        db.commit()
-        db.refresh(review)
+        # Check book exists
+        if db.execute(_BOOK_EXISTS, {"id": book_id}).first() is None:
+            raise NotFoundError(f"Book with ID {book_id} not found")
 
-        # Reload with user relationship
-        stmt = (
-            select(Review)
-            .options(selectinload(Review.user))
-            .where(Review.id == review.id)
-        )
-        review = db.execute(stmt).scalar_one()
+        # No pre-check SELECT for an existing review: the
+        # uq_review_book_user constraint rejects the duplicate on insert,
+        # which also closes the race between two concurrent requests. The
+        # savepoint undoes just the failed INSERT; the rest of the operation
+        # is left to UnitOfWorkExtension.
+        try:
+            with db.begin_nested():
+                # Assigning the relationship (not just user_id) means
+                # review.user is already populated for the response, so no
+                # reload is needed. The review is built inside the savepoint
+                # because begin_nested() flushes first, and the user's
+                # reviews collection mustn't hold it yet at that point.
+                review = Review(
+                    book_id=book_id,
+                    user=user,
+                    rating=input.rating,
+                    title=input.title,
+                    content=input.content,
+                )
+                db.add(review)
+        except IntegrityError:
+            raise ValidationError("You have already reviewed this book") from None
 
         return review_to_graphql(review)
 
@@ -594,12 +638,11 @@ class Mutation:
         user = require_auth(info)
         db = info.context.db
 
-        stmt = (
-            select(Review)
-            .options(selectinload(Review.user))
-            .where(Review.id == id)
-        )
-        review = db.execute(stmt).scalar_one_or_none()
+        # Validate rating before touching the database
+        if input.rating is not None and input.rating not in _VALID_RATINGS:
+            raise ValidationError("Rating must be between 1 and 5")
+
+        review = db.execute(_REVIEW_WITH_USER, {"id": id}).scalar_one_or_none()
 
         if review is None:
             raise NotFoundError(f"Review with ID {id} not found")
@@ -610,16 +653,15 @@ class Mutation:
 
         # Update fields
         if input.rating is not None:
-            if input.rating < 1 or input.rating > 5:
-                raise ValidationError("Rating must be between 1 and 5")
             review.rating = input.rating
         if input.title is not None:
             review.title = input.title
         if input.content is not None:
             review.content = input.content
 
-        db.commit()
-        db.refresh(review)
+        if db.is_modified(review):
+            db.flush()
+            db.refresh(review)
 
         return review_to_graphql(review)
 
@@ -638,8 +680,7 @@ class Mutation:
         user = require_auth(info)
         db = info.context.db
 
-        stmt = select(Review).where(Review.id == id)
-        review = db.execute(stmt).scalar_one_or_none()
+        review = db.get(Review, id)
 
         if review is None:
             raise NotFoundError(f"Review with ID {id} not found")
@@ -649,6 +690,6 @@ class Mutation:
             raise AuthorizationError("You can only delete your own reviews")
 
         db.delete(review)
-        db.commit()
+        db.flush()
 
         return True
@@ -5,14 +5,17 @@ Defines all read operations (queries) for the GraphQL API.
 Each resolver fetches data from the database using the context.
 """
 
-import asyncio
 import math
+from collections.abc import Collection
 
 import strawberry
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session, lazyload, selectinload
 from strawberry.types import Info
+from strawberry.types.nodes import SelectedField, Selection
 
+from app.config import get_settings
 from app.graphql.context import GraphQLContext
 from app.graphql.types.author import AuthorConnection, AuthorType
 from app.graphql.types.book import (
@@ -28,15 +31,33 @@ from app.graphql.types.review import ReviewConnection, ReviewType
 from app.graphql.types.user import UserPublicType, UserType
 from app.models import Author, Book, Genre
 from app.models.review import Review
+from app.services.cache import cache_get, cache_set, make_cache_key
 from app.services.recommendations import (
     get_recommendations_for_user,
     get_similar_books,
 )
 from app.services.search import search_books_advanced
 
+settings = get_settings()
 
-def book_to_graphql(book: Book, include_reviews: bool = False) -> BookType:
-    """Convert SQLAlchemy Book model to GraphQL BookType."""
+# Book relationships that are converted to GraphQL fields
+BOOK_RELATIONS = frozenset({"authors", "genres"})
+
+
+def book_to_graphql(
+    book: Book,
+    include_reviews: bool = False,
+    context: GraphQLContext | None = None,
+    relations: Collection[str] = BOOK_RELATIONS,
+) -> BookType:
+    """
+    Convert SQLAlchemy Book model to GraphQL BookType.
+
+    Pass the request context from query resolvers so that an author or
+    genre shared by many books on a page is converted once and reused.
+    Relations not listed in `relations` are left empty without being
+    read, so a query that didn't load them doesn't lazy-load them here.
+    """
     reviews = []
     if include_reviews and book.reviews:
         reviews = [review_to_graphql(r) for r in book.reviews]
@@ -54,37 +75,47 @@ def book_to_graphql(book: Book, include_reviews: bool = False) -> BookType:
         created_at=book.created_at,
         updated_at=book.updated_at,
         authors=[
-            AuthorType(
-                id=a.id,
-                name=a.name,
-                bio=a.bio,
-            )
-            for a in (book.authors or [])
+            author_to_graphql(a, context)
+            for a in (book.authors if "authors" in relations else [])
         ],
         genres=[
-            GenreType(id=g.id, name=g.name, description=g.description)
-            for g in (book.genres or [])
+            genre_to_graphql(g, context)
+            for g in (book.genres if "genres" in relations else [])
         ],
         reviews=reviews,
     )
 
 
-def author_to_graphql(author: Author) -> AuthorType:
+def author_to_graphql(
+    author: Author, context: GraphQLContext | None = None
+) -> AuthorType:
     """Convert SQLAlchemy Author model to GraphQL AuthorType."""
-    return AuthorType(
+    if context is not None and author.id in context.author_types:
+        return context.author_types[author.id]
+
+    author_type = AuthorType(
         id=author.id,
         name=author.name,
         bio=author.bio,
     )
+    if context is not None:
+        context.author_types[author.id] = author_type
+    return author_type
 
 
-def genre_to_graphql(genre: Genre) -> GenreType:
+def genre_to_graphql(genre: Genre, context: GraphQLContext | None = None) -> GenreType:
     """Convert SQLAlchemy Genre model to GraphQL GenreType."""
-    return GenreType(
+    if context is not None and genre.id in context.genre_types:
+        return context.genre_types[genre.id]
+
+    genre_type = GenreType(
         id=genre.id,
         name=genre.name,
         description=genre.description,
     )
+    if context is not None:
+        context.genre_types[genre.id] = genre_type
+    return genre_type
 
 
 def review_to_graphql(review: Review) -> ReviewType:
@@ -110,6 +141,116 @@ def review_to_graphql(review: Review) -> ReviewType:
     )
 
 
+def _flatten_selections(selections: list[Selection]) -> list[SelectedField]:
+    """Expand fragments so only plain fields are left."""
+    fields = []
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            fields.append(selection)
+        else:  # FragmentSpread / InlineFragment
+            fields.extend(_flatten_selections(selection.selections))
+    return fields
+
+
+def _requested_fields(info: Info[GraphQLContext, None], *path: str) -> set[str]:
+    """
+    Names of the fields the client selected on this resolver's result.
+
+    Args:
+        info: Resolver info
+        path: Fields to descend into first, e.g. "items" for a connection
+
+    Returns:
+        Selected field names at that level (as written in the query)
+    """
+    fields = [
+        child
+        for field in info.selected_fields
+        for child in _flatten_selections(field.selections)
+    ]
+    for name in path:
+        fields = [
+            child
+            for field in fields
+            if field.name == name
+            for child in _flatten_selections(field.selections)
+        ]
+    return {field.name for field in fields}
+
+
+def _book_relation_options(relations: Collection[str]) -> list:
+    """
+    Loader options for a book query, loading only the given relations.
+
+    The others are left unloaded rather than set to empty (as noload()
+    would), because the Book may be reused from the session's identity map
+    by a later field in the same request that does select them. Pass the
+    same relations to book_to_graphql so it doesn't touch the unloaded ones.
+    """
+    return [
+        selectinload(relationship) if name in relations else lazyload(relationship)
+        for name, relationship in (("authors", Book.authors), ("genres", Book.genres))
+    ]
+
+
+def _recommendation_score(result: dict) -> float | None:
+    """
+    Score of a get_recommendations_for_user() result.
+
+    The key depends on the strategy that produced it: collaborative
+    filtering, the content-based fallback, or trending books (cold start).
+    """
+    for key in ("recommendation_score", "similarity_score", "trending_score"):
+        if key in result:
+            return result[key]
+    return None
+
+
+def _fetch_page(
+    db: Session,
+    stmt: Select,
+    page: int,
+    per_page: int,
+    total_cache_key: str | None = None,
+) -> tuple[list, int]:
+    """
+    Fetch one page of an ordered single-entity query plus the total count.
+
+    count(*) OVER () is computed before LIMIT/OFFSET apply, so every row of
+    the page carries the total and one query does the work of two. A page
+    past the end has no rows to carry it; only then is a separate COUNT run.
+
+    With total_cache_key (only for unfiltered lists), the total is kept in
+    the cache for settings.cache_ttl_lists seconds. While it's cached the
+    page query drops the window function, so the database can stop after
+    the requested rows instead of counting the whole table.
+
+    Returns:
+        Tuple of (objects on the page, total matching rows)
+    """
+    offset = (page - 1) * per_page
+
+    if total_cache_key is not None:
+        total = cache_get(total_cache_key)
+        if total is not None:
+            rows = db.execute(stmt.offset(offset).limit(per_page)).scalars().all()
+            return list(rows), total
+
+    page_stmt = stmt.add_columns(func.count().over()).offset(offset).limit(per_page)
+    rows = db.execute(page_stmt).all()
+    if rows:
+        total = rows[0][1]
+    elif offset <= 0:
+        total = 0
+    else:
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        total = db.execute(count_stmt).scalar() or 0
+
+    if total_cache_key is not None:
+        cache_set(total_cache_key, total, ttl=settings.cache_ttl_lists)
+    return [row[0] for row in rows], total
+
+
 @strawberry.type
 class Query:
     """
@@ -147,14 +288,14 @@ class Query:
         # Clamp per_page to reasonable limits
         per_page = min(max(1, per_page), 100)
 
-        # Build query
-        stmt = select(Book).options(
-            selectinload(Book.authors), selectinload(Book.genres)
-        )
+        # Build query, loading authors/genres only if the client asked for them
+        relations = BOOK_RELATIONS & _requested_fields(info, "items")
+        stmt = select(Book).options(*_book_relation_options(relations))
 
         # Apply filters
+        filtered = bool(title or genre_id or author_id)
         if title:
-            stmt = stmt.where(func.lower(Book.title).contains(title.lower()))
+            stmt = stmt.where(Book.title.icontains(title, autoescape=True))
 
         if genre_id:
             stmt = stmt.join(Book.genres).where(Genre.id == genre_id)
@@ -162,20 +303,18 @@ class Query:
         if author_id:
             stmt = stmt.join(Book.authors).where(Author.id == author_id)
 
-        # Count total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = db.execute(count_stmt).scalar() or 0
-
-        # Calculate pagination
+        # Fetch the page and the total count together (the unfiltered
+        # total is cached, see _fetch_page)
+        stmt = stmt.order_by(Book.created_at.desc())
+        total_key = None if filtered else make_cache_key("books", "total")
+        books, total = _fetch_page(db, stmt, page, per_page, total_key)
         pages = math.ceil(total / per_page) if total > 0 else 0
-        offset = (page - 1) * per_page
-
-        # Fetch books
-        stmt = stmt.offset(offset).limit(per_page).order_by(Book.created_at.desc())
-        books = db.execute(stmt).scalars().all()
 
         return BookConnection(
-            items=[book_to_graphql(b) for b in books],
+            items=[
+                book_to_graphql(b, context=info.context, relations=relations)
+                for b in books
+            ],
             total=total,
             page=page,
             per_page=per_page,
@@ -201,9 +340,10 @@ class Query:
         """
         db = info.context.db
 
+        relations = BOOK_RELATIONS & _requested_fields(info)
         stmt = (
             select(Book)
-            .options(selectinload(Book.authors), selectinload(Book.genres))
+            .options(*_book_relation_options(relations))
             .where(Book.id == id)
         )
 
@@ -215,7 +355,12 @@ class Query:
         if book is None:
             return None
 
-        return book_to_graphql(book, include_reviews=include_reviews)
+        return book_to_graphql(
+            book,
+            include_reviews=include_reviews,
+            context=info.context,
+            relations=relations,
+        )
 
     @strawberry.field(description="Get a paginated list of authors")
     def authors(
@@ -242,18 +387,14 @@ class Query:
         stmt = select(Author)
 
         if name:
-            stmt = stmt.where(func.lower(Author.name).contains(name.lower()))
+            stmt = stmt.where(Author.name.icontains(name, autoescape=True))
 
-        # Count total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = db.execute(count_stmt).scalar() or 0
-
-        # Calculate pagination
+        # Fetch the page and the total count together (the unfiltered
+        # total is cached, see _fetch_page)
+        stmt = stmt.order_by(Author.name)
+        total_key = None if name else make_cache_key("authors", "total")
+        authors, total = _fetch_page(db, stmt, page, per_page, total_key)
         pages = math.ceil(total / per_page) if total > 0 else 0
-        offset = (page - 1) * per_page
-
-        stmt = stmt.offset(offset).limit(per_page).order_by(Author.name)
-        authors = db.execute(stmt).scalars().all()
 
         return AuthorConnection(
             items=[author_to_graphql(a) for a in authors],
@@ -283,25 +424,35 @@ class Query:
         page: int = 1,
         per_page: int = 50,
     ) -> GenreConnection:
-        """Get all available genres with pagination."""
+        """
+        Get all available genres with pagination.
+
+        Genres rarely change, so each page is cached for
+        settings.cache_ttl_lists seconds. Genre changes clear it through
+        invalidate_genre_cache(), which drops every "genres:*" key.
+        """
         db = info.context.db
         per_page = min(max(1, per_page), 100)
 
-        stmt = select(Genre)
-
-        # Count total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = db.execute(count_stmt).scalar() or 0
+        cache_key = make_cache_key("genres", "graphql", page=page, per_page=per_page)
+        cached = cache_get(cache_key)
+        if cached is None:
+            stmt = select(Genre).order_by(Genre.name)
+            genres, total = _fetch_page(db, stmt, page, per_page)
+            cached = {
+                "items": [
+                    {"id": g.id, "name": g.name, "description": g.description}
+                    for g in genres
+                ],
+                "total": total,
+            }
+            cache_set(cache_key, cached, ttl=settings.cache_ttl_lists)
 
-        # Calculate pagination
+        total = cached["total"]
         pages = math.ceil(total / per_page) if total > 0 else 0
-        offset = (page - 1) * per_page
-
-        stmt = stmt.offset(offset).limit(per_page).order_by(Genre.name)
-        genres = db.execute(stmt).scalars().all()
 
         return GenreConnection(
-            items=[genre_to_graphql(g) for g in genres],
+            items=[GenreType(**g) for g in cached["items"]],
             total=total,
             page=page,
             per_page=per_page,
@@ -349,16 +500,10 @@ class Query:
             .where(Review.book_id == book_id)
         )
 
-        # Count total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = db.execute(count_stmt).scalar() or 0
-
-        # Calculate pagination
+        # Fetch the page and the total count together
+        stmt = stmt.order_by(Review.created_at.desc())
+        reviews, total = _fetch_page(db, stmt, page, per_page)
         pages = math.ceil(total / per_page) if total > 0 else 0
-        offset = (page - 1) * per_page
-
-        stmt = stmt.offset(offset).limit(per_page).order_by(Review.created_at.desc())
-        reviews = db.execute(stmt).scalars().all()
 
         return ReviewConnection(
             items=[review_to_graphql(r) for r in reviews],
@@ -391,7 +536,7 @@ class Query:
         )
 
     @strawberry.field(description="Search books using Elasticsearch with filters")
-    def search(
+    async def search(
         self,
         info: Info[GraphQLContext, None],
         query: str | None = None,
@@ -422,9 +567,12 @@ class Query:
         min_price = filters.min_price if filters else None
         max_price = filters.max_price if filters else None
 
-        # Run async search in sync context
-        result = asyncio.get_event_loop().run_until_complete(
-            search_books_advanced(
+        # Strawberry awaits async resolvers on the server's event loop. The
+        # Elasticsearch call is async; the sync database work (the PostgreSQL
+        # fallback and load_books) runs in the threadpool instead. db_lock
+        # keeps aliased search fields from using the session concurrently.
+        async with info.context.db_lock:
+            result = await search_books_advanced(
                 db=db,
                 query=query,
                 genres=genres,
@@ -436,45 +584,21 @@ class Query:
                 page=page,
                 size=per_page,
             )
-        )
 
-        # Convert results to GraphQL types
-        items = []
-        for item in result.get("items", []):
-            book_data = item.get("book", item)
-            # Create minimal BookType from search results
-            book_type = BookType(
-                id=book_data.get("id"),
-                title=book_data.get("title", ""),
-                isbn=book_data.get("isbn"),
-                description=book_data.get("description"),
-                publication_date=book_data.get("publication_date"),
-                page_count=book_data.get("page_count"),
-                price=book_data.get("price"),
-                average_rating=book_data.get("average_rating"),
-                review_count=book_data.get("review_count", 0),
-                created_at=book_data.get("created_at"),
-                updated_at=book_data.get("updated_at"),
-                authors=[
-                    AuthorType(
-                        id=a.get("id"),
-                        name=a.get("name", ""),
-                        bio=a.get("bio"),
-                    )
-                    for a in book_data.get("authors", [])
-                ],
-                genres=[
-                    GenreType(
-                        id=g.get("id"),
-                        name=g.get("name", ""),
-                        description=g.get("description"),
-                    )
-                    for g in book_data.get("genres", [])
-                ],
+            # Search hits are flat documents (author and genre names only), so
+            # load the full books by ID in one batched query, keeping hit order
+            hits = result.get("items", [])
+            books = await run_in_threadpool(
+                info.context.load_books, [hit["id"] for hit in hits]
             )
-            items.append(
-                SearchResultItem(book=book_type, score=item.get("score"))
+        items = [
+            SearchResultItem(
+                book=book_to_graphql(books[hit["id"]], context=info.context),
+                score=hit.get("relevance_score"),
             )
+            for hit in hits
+            if hit["id"] in books
+        ]
 
         # Convert facets
         facets = []
@@ -517,38 +641,33 @@ class Query:
         db = info.context.db
         limit = min(max(1, limit), 50)
 
-        # Get user's read books to exclude (if authenticated)
-        exclude_ids = []
+        # Exclude books the user has reviewed (i.e., read), if authenticated
+        exclude_subquery = None
         user = info.context.user
         if user:
-            # Get book IDs the user has reviewed (i.e., read)
-            stmt = select(Review.book_id).where(Review.user_id == user.id)
-            exclude_ids = list(db.execute(stmt).scalars().all())
+            exclude_subquery = select(Review.book_id).where(Review.user_id == user.id)
 
         results = get_similar_books(
             db=db,
             book_id=book_id,
             limit=limit,
-            exclude_book_ids=exclude_ids if exclude_ids else None,
+            exclude_subquery=exclude_subquery,
         )
 
-        # Convert to GraphQL types
+        # Fetch full book data for all results in one query
+        books = info.context.load_books(
+            [result.get("book", {}).get("id") for result in results]
+        )
+
+        # Convert to GraphQL types, keeping the ranking order
         items = []
         for result in results:
-            book_data = result.get("book", {})
-            # Fetch full book data
-            stmt = (
-                select(Book)
-                .options(selectinload(Book.authors), selectinload(Book.genres))
-                .where(Book.id == book_data.get("id"))
-            )
-            book = db.execute(stmt).scalar_one_or_none()
-
+            book = books.get(result.get("book", {}).get("id"))
             if book:
                 items.append(
                     SearchResultItem(
-                        book=book_to_graphql(book),
-                        score=result.get("score"),
+                        book=book_to_graphql(book, context=info.context),
+                        score=result.get("similarity_score"),
                     )
                 )
 
@@ -587,23 +706,20 @@ class Query:
             limit=limit,
         )
 
-        # Convert to GraphQL types
+        # Fetch full book data for all results in one query
+        books = info.context.load_books(
+            [result.get("book", {}).get("id") for result in results]
+        )
+
+        # Convert to GraphQL types, keeping the ranking order
         items = []
         for result in results:
-            book_data = result.get("book", {})
-            # Fetch full book data
-            stmt = (
-                select(Book)
-                .options(selectinload(Book.authors), selectinload(Book.genres))
-                .where(Book.id == book_data.get("id"))
-            )
-            book = db.execute(stmt).scalar_one_or_none()
-
+            book = books.get(result.get("book", {}).get("id"))
             if book:
                 items.append(
                     SearchResultItem(
-                        book=book_to_graphql(book),
-                        score=result.get("score"),
+                        book=book_to_graphql(book, context=info.context),
+                        score=_recommendation_score(result),
                     )
                 )
 
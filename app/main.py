@@ -32,6 +32,7 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html
 from fastapi.responses import HTMLResponse, JSONResponse
@@ -40,6 +41,7 @@ from slowapi.middleware import SlowAPIMiddleware
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import get_settings
+from app.database import warm_up_pool
 from app.graphql import create_graphql_router
 from app.routers import (
     api_keys_router,
@@ -101,6 +103,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"API version: {settings.api_version}")
 
+    # Open the database pool's connections before the first request. The
+    # connects and SELECT 1s are blocking, so run them in the threadpool
+    # instead of stalling the event loop (for the full connect timeout per
+    # attempt if the database is unreachable).
+    if await run_in_threadpool(warm_up_pool):
+        logger.info("Database connection pool warmed up")
+    else:
+        logger.warning("Database unavailable at startup - pool not warmed")
+
     # Initialize Redis connection
     redis_client = get_redis_client()
     if redis_client:
@@ -12,7 +12,7 @@ Security Features:
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String, Text, func
+from sqlalchemy import Boolean, DateTime, String, Text, func, true
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -73,6 +73,7 @@ class APIKey(Base):
     is_active: Mapped[bool] = mapped_column(
         Boolean,
         default=True,
+        server_default=true(),
         nullable=False,
         comment="Whether the key is currently active"
     )
@@ -13,7 +13,7 @@ SQLAlchemy 2.0 Features Used:
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import DateTime, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -35,7 +35,8 @@ class Author(Base):
 
     Indexes:
     - Primary key on id (automatic)
-    - name: For searching authors by name
+    - name: For sorting, plus a trigram index (PostgreSQL) for
+      case-insensitive "contains" searches by name
 
     Example:
         author = Author(
@@ -48,6 +49,17 @@ class Author(Base):
 
     __tablename__ = "authors"
 
+    # GIN trigram index so ILIKE '%term%' on name can use an index
+    # (PostgreSQL only; needs pg_trgm, see app/models/book.py)
+    __table_args__ = (
+        Index(
+            "ix_authors_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # -------------------------------------------------------------------------
     # Primary Key
     # -------------------------------------------------------------------------
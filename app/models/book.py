@@ -24,15 +24,18 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
+    DDL,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Table,
     Text,
+    event,
     func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -113,7 +116,8 @@ class Book(Base):
     Indexes:
     - Primary key on id (automatic)
     - isbn: Unique index for lookups
-    - title: Index for searching
+    - title: Index for sorting, plus a trigram index (PostgreSQL) for
+      case-insensitive "contains" searches
     - publication_date: Index for sorting/filtering
 
     Example:
@@ -129,6 +133,17 @@ class Book(Base):
 
     __tablename__ = "books"
 
+    # A btree index can't serve ILIKE '%term%'; a pg_trgm GIN index can.
+    # PostgreSQL only, so SQLite (tests) skips it.
+    __table_args__ = (
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # -------------------------------------------------------------------------
     # Primary Key
     # -------------------------------------------------------------------------
@@ -250,3 +265,12 @@ class Book(Base):
 
     def __repr__(self) -> str:
         return f"Book(id={self.id}, title='{self.title}', isbn='{self.isbn}')"
+
+
+# The trigram indexes on books.title and authors.name need the pg_trgm
+# extension, so create it first when the tables are built without Alembic
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -11,7 +11,7 @@ Handles user authentication endpoints:
 
 Security:
 =========
-- Passwords are hashed with bcrypt before storage
+- Passwords are hashed with argon2id before storage
 - Plain text passwords are never logged or stored
 - JWT tokens are used for session management
 - Access tokens are short-lived (15 min default)
@@ -19,11 +19,10 @@ Security:
 """
 
 import logging
-from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from app.config import get_settings
 from app.dependencies import ActiveUser, DbSession
@@ -36,9 +35,11 @@ from app.schemas.user import (
 )
 from app.services.rate_limiter import limiter
 from app.services.security import (
+    DUMMY_PASSWORD_HASH,
     create_access_token,
     create_refresh_token,
     hash_password,
+    password_needs_rehash,
     verify_password,
     verify_token_type,
 )
@@ -91,7 +92,7 @@ def register(
 
     1. Validates email and password format (handled by Pydantic)
     2. Checks for duplicate email/username
-    3. Hashes password with bcrypt
+    3. Hashes password with argon2id
     4. Creates user record
     5. Returns user data (without password)
     """
@@ -185,8 +186,16 @@ def login(
     stmt = select(User).where(User.email == email)
     user = db.execute(stmt).scalar_one_or_none()
 
-    # Check if user exists and password is correct
-    if not user or not user.hashed_password:
+    # Check if user exists and password is correct. The hash check runs
+    # first, even without a real hash, so an unknown email takes as long to
+    # reject as a wrong password and timing doesn't reveal which exist.
+    has_password = bool(user and user.hashed_password)
+    password_ok = verify_password(
+        password,
+        user.hashed_password if has_password else DUMMY_PASSWORD_HASH,
+    )
+
+    if not has_password:
         logger.warning(f"Login failed: user not found for {email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -194,7 +203,7 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(password, user.hashed_password):
+    if not password_ok:
         logger.warning(f"Login failed: incorrect password for {email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -215,8 +224,14 @@ def login(
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
 
-    # Update last login timestamp
-    user.last_login_at = datetime.now(UTC)
+    # Upgrade bcrypt (or outdated argon2) hashes while we have the password
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = hash_password(password)
+
+    # Update last login timestamp. func.now() is rendered into the UPDATE,
+    # so the database clock sets it; the attribute is expired afterwards
+    # and only reloaded if something reads it.
+    user.last_login_at = func.now()
     db.commit()
 
     # Set refresh token as httpOnly cookie (more secure than returning in body)
@@ -224,7 +239,7 @@ def login(
         key="refresh_token",
         value=refresh_token,
         httponly=True,  # Not accessible via JavaScript
-        secure=settings.environment == "production",  # HTTPS only in production
+        secure=settings.is_production,  # HTTPS only in production
         samesite="lax",  # CSRF protection
         max_age=settings.refresh_token_expire_days * 24 * 60 * 60,  # Days to seconds
     )
@@ -359,7 +374,7 @@ def logout(
     response.delete_cookie(
         key="refresh_token",
         httponly=True,
-        secure=settings.environment == "production",
+        secure=settings.is_production,
         samesite="lax",
     )
 
@@ -493,7 +508,7 @@ async def google_callback(
     refresh_token = create_refresh_token(token_data)
 
     # Update last login
-    user.last_login_at = datetime.now(UTC)
+    user.last_login_at = func.now()
     db.commit()
 
     # Set refresh token cookie
@@ -501,7 +516,7 @@ async def google_callback(
         key="refresh_token",
         value=refresh_token,
         httponly=True,
-        secure=settings.environment == "production",
+        secure=settings.is_production,
         samesite="lax",
         max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
     )
@@ -606,7 +621,7 @@ async def github_callback(
     refresh_token = create_refresh_token(token_data)
 
     # Update last login
-    user.last_login_at = datetime.now(UTC)
+    user.last_login_at = func.now()
     db.commit()
 
     # Set refresh token cookie
@@ -614,7 +629,7 @@ async def github_callback(
         key="refresh_token",
         value=refresh_token,
         httponly=True,
-        secure=settings.environment == "production",
+        secure=settings.is_production,
         samesite="lax",
         max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
     )
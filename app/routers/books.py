@@ -26,6 +26,7 @@ from app.dependencies import (
     BookFilters,
     DbSession,
     Pagination,
+    ReadOnlyDbSession,
     RequireAPIKey,
     get_book_or_404,
 )
@@ -101,30 +102,29 @@ def apply_book_filters(stmt, filters: BookFilters, db: DbSession):
     """
     # General search (searches both title and author name)
     if filters.q:
-        search_term = f"%{filters.q.lower()}%"
         # Subquery to find books by author name
         author_book_ids = (
             select(Book.id)
             .join(Book.authors)
-            .where(func.lower(Author.name).like(search_term))
+            .where(Author.name.icontains(filters.q, autoescape=True))
         )
         stmt = stmt.where(
             or_(
-                func.lower(Book.title).like(search_term),
+                Book.title.icontains(filters.q, autoescape=True),
                 Book.id.in_(author_book_ids),
             )
         )
 
     # Filter by title (partial match, case-insensitive)
     if filters.title:
-        stmt = stmt.where(func.lower(Book.title).like(f"%{filters.title.lower()}%"))
+        stmt = stmt.where(Book.title.icontains(filters.title, autoescape=True))
 
     # Filter by author name (partial match, case-insensitive)
     if filters.author:
         author_book_ids = (
             select(Book.id)
             .join(Book.authors)
-            .where(func.lower(Author.name).like(f"%{filters.author.lower()}%"))
+            .where(Author.name.icontains(filters.author, autoescape=True))
         )
         stmt = stmt.where(Book.id.in_(author_book_ids))
 
@@ -169,7 +169,7 @@ def apply_book_filters(stmt, filters: BookFilters, db: DbSession):
 @limiter.limit(settings.rate_limit_search)
 def search_books(
     request: Request,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     pagination: Pagination,
     filters: BookFilters,
 ) -> BookListResponse:
@@ -232,7 +232,7 @@ def search_books(
 @limiter.limit(settings.rate_limit_default)
 def get_top_rated_books(
     request: Request,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     pagination: Pagination,
     min_reviews: int = 1,
 ) -> BookListResponse:
@@ -290,7 +290,7 @@ def get_top_rated_books(
 @limiter.limit(settings.rate_limit_default)
 def list_books(
     request: Request,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     pagination: Pagination,
     filters: BookFilters,
 ) -> BookListResponse:
@@ -378,7 +378,6 @@ def get_book(
     response = BookResponse.model_validate(book)
 
     # Cache the result
-    settings = get_settings()
     cache_set(cache_key, response.model_dump(mode="json"), ttl=settings.cache_ttl_books)
 
     return response
@@ -251,19 +251,18 @@ def get_similar(
             detail=f"Book with id {book_id} not found",
         )
 
-    # Get books the user has already read (to optionally exclude)
-    exclude_book_ids = None
+    # Exclude books the user has already read (checked in the database)
+    exclude_subquery = None
     if current_user:
-        user_books = db.execute(
-            select(Review.book_id).where(Review.user_id == current_user.id)
-        ).scalars().all()
-        exclude_book_ids = list(user_books)
+        exclude_subquery = select(Review.book_id).where(
+            Review.user_id == current_user.id
+        )
 
     results = get_similar_books(
         db=db,
         book_id=book_id,
         limit=limit,
-        exclude_book_ids=exclude_book_ids,
+        exclude_subquery=exclude_subquery,
     )
 
     items = []
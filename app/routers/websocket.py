@@ -22,7 +22,6 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -60,8 +59,7 @@ def get_user_from_token(db: Session, token: str | None) -> User | None:
         return None
 
     try:
-        stmt = select(User).where(User.id == int(user_id))
-        user = db.execute(stmt).scalar_one_or_none()
+        user = db.get(User, int(user_id))
         return user
     except Exception as e:
         logger.warning(f"Error fetching user from token: {e}")
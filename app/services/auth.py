@@ -9,11 +9,29 @@ Security Features:
 2. Plain keys are only shown once during creation
 3. Supports admin key from environment variable
 4. Tracks key usage for auditing
+5. Caches validation results in-process for a short TTL
+
+Validation Cache
+================
+Every request to a protected endpoint validates its X-API-Key, which is
+a database lookup. is_api_key_valid() remembers the outcome (valid or
+invalid) per key hash for settings.api_key_cache_ttl seconds, so repeat
+requests skip the query. Only the SHA-256 hash is stored, never the
+plain key. last_used_at is only refreshed when a lookup actually hits
+the database.
+
+The cache lives in each worker process. Revoking a key evicts it at once
+on the worker that handled the revocation only; with several uvicorn or
+gunicorn workers, the others keep accepting it until their entry expires
+(at most api_key_cache_ttl seconds). Set the TTL to 0 if revocation must
+take effect everywhere immediately.
 """
 
 import hashlib
 import logging
 import secrets
+import threading
+import time
 from datetime import UTC, datetime
 
 from sqlalchemy import select
@@ -28,6 +46,11 @@ settings = get_settings()
 # Key prefix for identification
 KEY_PREFIX = "bk_"
 
+# key_hash -> (is_valid, monotonic deadline)
+_validation_cache: dict[str, tuple[bool, float]] = {}
+_validation_cache_lock = threading.Lock()
+VALIDATION_CACHE_MAXSIZE = 10_000
+
 
 def generate_api_key() -> tuple[str, str, str]:
     """
@@ -59,6 +82,20 @@ def generate_api_key() -> tuple[str, str, str]:
     return full_key, key_hash, key_prefix
 
 
+def _is_admin_key(key: str) -> bool:
+    """
+    Check whether key is the admin key from the environment.
+
+    Uses a constant-time comparison: the admin key is compared as a
+    plain secret (no hash lookup), so == would leak how many leading
+    characters matched through response timing.
+    """
+    admin_key = settings.admin_api_key
+    return bool(admin_key) and secrets.compare_digest(
+        key.encode(), admin_key.encode()
+    )
+
+
 def hash_api_key(key: str) -> str:
     """
     Hash an API key using SHA-256.
@@ -89,13 +126,15 @@ def validate_api_key(db: Session, key: str) -> APIKey | None:
         APIKey record if valid, None otherwise
     """
     # First check if it's the admin key
-    if settings.admin_api_key and key == settings.admin_api_key:
+    if _is_admin_key(key):
         logger.debug("Admin API key used")
         return _create_admin_key_record()
 
-    # Hash the provided key
-    key_hash = hash_api_key(key)
+    return _lookup_api_key(db, hash_api_key(key))
+
 
+def _lookup_api_key(db: Session, key_hash: str) -> APIKey | None:
+    """Look up an active, unexpired key by hash and record its use."""
     # Look up in database
     stmt = select(APIKey).where(
         APIKey.key_hash == key_hash,
@@ -118,6 +157,70 @@ def validate_api_key(db: Session, key: str) -> APIKey | None:
     return api_key
 
 
+def is_api_key_valid(db: Session, key: str) -> bool:
+    """
+    Check an API key, using the in-process validation cache.
+
+    The admin key is a plain string comparison and is never cached.
+    Other keys are looked up in the database on a cache miss, and the
+    result (including "invalid") is cached for api_key_cache_ttl seconds,
+    or until the key expires if that is sooner. A TTL of 0 disables the
+    cache.
+
+    Args:
+        db: Database session
+        key: The plain API key to validate
+
+    Returns:
+        True if the key is valid, False otherwise
+    """
+    if _is_admin_key(key):
+        return True
+
+    ttl = settings.api_key_cache_ttl
+    if ttl <= 0:
+        return validate_api_key(db, key) is not None
+
+    key_hash = hash_api_key(key)
+    now = time.monotonic()
+
+    with _validation_cache_lock:
+        entry = _validation_cache.get(key_hash)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    api_key = _lookup_api_key(db, key_hash)
+    is_valid = api_key is not None
+    if is_valid and api_key.expires_at:
+        remaining = (api_key.expires_at - datetime.now(UTC)).total_seconds()
+        ttl = min(ttl, remaining)
+
+    with _validation_cache_lock:
+        if len(_validation_cache) >= VALIDATION_CACHE_MAXSIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _validation_cache.pop(next(iter(_validation_cache)))
+        _validation_cache[key_hash] = (is_valid, now + ttl)
+
+    return is_valid
+
+
+def invalidate_api_key_cache(key_hash: str | None = None) -> None:
+    """
+    Evict a key from this process's validation cache.
+
+    Other worker processes keep their own entry until it expires.
+
+    Args:
+        key_hash: SHA-256 hash of the key to evict, or None to clear
+                  the whole cache
+    """
+    with _validation_cache_lock:
+        if key_hash is None:
+            _validation_cache.clear()
+        else:
+            _validation_cache.pop(key_hash, None)
+
+
 def _create_admin_key_record() -> APIKey:
     """
     Create a virtual APIKey record for the admin key.
@@ -200,6 +303,7 @@ def revoke_api_key(db: Session, key_id: int) -> APIKey | None:
     api_key.is_active = False
     db.commit()
     db.refresh(api_key)
+    invalidate_api_key_cache(api_key.key_hash)
 
     logger.info(f"Revoked API key: {api_key.key_prefix}...")
 
@@ -17,7 +17,7 @@ import math
 from collections import defaultdict
 from typing import Any
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import Select, desc, func, select
 from sqlalchemy.orm import Session, selectinload
 
 from app.config import get_settings
@@ -44,6 +44,7 @@ def get_similar_books(
     book_id: int,
     limit: int = 10,
     exclude_book_ids: list[int] | None = None,
+    exclude_subquery: Select | None = None,
 ) -> list[dict[str, Any]]:
     """
     Find books similar to a given book based on genres and authors.
@@ -60,6 +61,9 @@ def get_similar_books(
         book_id: ID of the book to find similar books for
         limit: Maximum number of recommendations
         exclude_book_ids: Book IDs to exclude (e.g., already read)
+        exclude_subquery: SELECT of book IDs to exclude, checked by the
+            database against the candidates only (e.g., a user's reviewed
+            books, which may be far more than the candidates)
 
     Returns:
         List of similar books with similarity scores and reasons
@@ -69,8 +73,7 @@ def get_similar_books(
     cached = cache_get(cache_key)
     if cached is not None:
         # Filter out excluded books from cached results
-        if exclude_book_ids:
-            cached = [b for b in cached if b["book"]["id"] not in exclude_book_ids]
+        cached = _apply_exclusions(db, cached, exclude_book_ids, exclude_subquery)
         return cached[:limit]
 
     # Get the source book with its relationships
@@ -197,12 +200,40 @@ def get_similar_books(
     cache_set(cache_key, results, ttl=settings.recommendation_cache_ttl)
 
     # Apply exclusions
-    if exclude_book_ids:
-        results = [r for r in results if r["book"]["id"] not in exclude_book_ids]
+    results = _apply_exclusions(db, results, exclude_book_ids, exclude_subquery)
 
     return results[:limit]
 
 
+def _apply_exclusions(
+    db: Session,
+    results: list[dict[str, Any]],
+    exclude_book_ids: list[int] | None,
+    exclude_subquery: Select | None,
+) -> list[dict[str, Any]]:
+    """
+    Drop excluded books from a list of similar-book results.
+
+    Results are cached before exclusions are applied, so exclusions are
+    always checked here. A subquery is only matched against the candidate
+    IDs, so the full exclusion list never has to be loaded into Python.
+    """
+    excluded = set(exclude_book_ids or ())
+    if exclude_subquery is not None and results:
+        candidate_ids = [r["book"]["id"] for r in results]
+        excluded.update(
+            db.execute(
+                select(Book.id)
+                .where(Book.id.in_(candidate_ids))
+                .where(Book.id.in_(exclude_subquery))
+            ).scalars()
+        )
+
+    if not excluded:
+        return results
+    return [r for r in results if r["book"]["id"] not in excluded]
+
+
 # =============================================================================
 # Collaborative Filtering
 # =============================================================================
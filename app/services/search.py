@@ -16,6 +16,7 @@ import logging
 import math
 from typing import Any
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import extract, func, or_, select
 from sqlalchemy.orm import Session, selectinload
 
@@ -81,9 +82,11 @@ async def search_books_advanced(
         if not result.get("fallback", False):
             return result
 
-    # Fallback to PostgreSQL search
+    # Fallback to PostgreSQL search. The session is synchronous, so run it
+    # in the threadpool rather than blocking the event loop on its queries.
     logger.debug("Falling back to PostgreSQL for search")
-    return _search_books_postgres(
+    return await run_in_threadpool(
+        _search_books_postgres,
         db=db,
         query=query,
         genres=genres,
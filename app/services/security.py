@@ -5,9 +5,10 @@ Handles password hashing and JWT token operations.
 
 Security Features:
 ==================
-1. Password hashing with bcrypt (passlib)
+1. Password hashing with argon2id (passlib), upgrading old bcrypt hashes
 2. JWT token generation and validation
 3. Secure password verification
+4. Short-lived in-process caches of verified passwords and decoded tokens
 
 Usage:
     from app.services.security import hash_password, verify_password
@@ -19,7 +20,12 @@ Usage:
     is_valid = verify_password("SecurePass123", hashed)
 """
 
+import hashlib
+import hmac
 import logging
+import secrets
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 
 from jose import JWTError, jwt
@@ -33,30 +39,99 @@ settings = get_settings()
 # -------------------------------------------------------------------------
 # Password Hashing Configuration
 # -------------------------------------------------------------------------
-# CryptContext handles password hashing with bcrypt
-# - schemes: List of hashing algorithms (bcrypt is industry standard)
-# - deprecated: "auto" means old hashes are automatically upgraded
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# CryptContext handles password hashing with argon2id
+# - schemes: List of hashing algorithms. The first one hashes new passwords;
+#   the rest can still be verified. bcrypt stays so existing users can log in.
+# - deprecated: "auto" marks every scheme but the first as deprecated, so
+#   password_needs_rehash() reports bcrypt hashes (and argon2 hashes made
+#   with older cost settings) for upgrading at the next login
+#
+# WHY argon2id?
+# =============
+# bcrypt is CPU-hard only. argon2id is also memory-hard: each guess needs
+# argon2_memory_cost KiB of RAM, which is what makes GPU/ASIC cracking of a
+# leaked table expensive. At 64 MiB and two passes it costs the server
+# about as much per login as bcrypt did.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+# -------------------------------------------------------------------------
+# Verified Password Cache
+# -------------------------------------------------------------------------
+# Password hashing is slow on purpose, so API clients that log in again and again with
+# the same credentials pay for it every time. verify_password() remembers
+# successful checks for settings.password_cache_ttl seconds. Entries are
+# keyed by an HMAC of (stored hash, password) under a random per-process
+# key, so the cache holds nothing that can be attacked offline. Failed
+# checks are never cached, and changing the password changes the stored
+# hash, which makes old entries unreachable.
+_PASSWORD_CACHE_KEY = secrets.token_bytes(32)
+_verified_cache: dict[bytes, float] = {}
+_verified_cache_lock = threading.Lock()
+VERIFIED_CACHE_MAXSIZE = 4_096
+
+# -------------------------------------------------------------------------
+# Decoded Token Cache
+# -------------------------------------------------------------------------
+# A client sends the same access token with every request until it
+# expires. decode_token() remembers successfully decoded payloads, keyed by
+# a SHA-256 hash of the token (never the token itself), for at most
+# settings.jwt_cache_ttl seconds and never past the token's "exp".
+# Only the signature check is skipped; callers still load the user from
+# the database, so deactivating a user takes effect immediately.
+_decoded_cache: dict[bytes, tuple[dict, float]] = {}
+_decoded_cache_lock = threading.Lock()
+DECODED_CACHE_MAXSIZE = 10_000
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password using argon2id.
 
     Args:
         password: Plain text password
 
     Returns:
-        Bcrypt hash of the password
+        Argon2id hash of the password
 
     Example:
         >>> hashed = hash_password("SecurePass123")
-        >>> hashed.startswith("$2b$")
+        >>> hashed.startswith("$argon2id$")
         True
     """
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash should be replaced with a fresh one.
+
+    True for bcrypt hashes and for argon2 hashes made with different cost
+    settings. Call it after a successful login, while the plain password is
+    at hand, and store hash_password(plain) if it returns True.
+
+    Args:
+        hashed_password: The stored hash
+
+    Returns:
+        True if the hash uses an outdated scheme or parameters
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+# Hash of a random password nobody knows. Logins for unknown emails (and
+# social-only accounts without a password) verify against it, so they take
+# as long as a wrong password for a real account and response timing
+# doesn't reveal which emails are registered.
+DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
@@ -65,7 +140,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     Args:
         plain_password: The password to verify
-        hashed_password: The stored bcrypt hash
+        hashed_password: The stored argon2 or bcrypt hash
 
     Returns:
         True if password matches, False otherwise
@@ -77,7 +152,31 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         >>> verify_password("WrongPassword", hashed)
         False
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    ttl = settings.password_cache_ttl
+    if ttl <= 0:
+        return pwd_context.verify(plain_password, hashed_password)
+
+    cache_key = hmac.digest(
+        _PASSWORD_CACHE_KEY,
+        f"{hashed_password}\0{plain_password}".encode(),
+        "sha256",
+    )
+    now = time.monotonic()
+    with _verified_cache_lock:
+        deadline = _verified_cache.get(cache_key)
+    if deadline is not None and deadline > now:
+        return True
+
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+
+    with _verified_cache_lock:
+        if len(_verified_cache) >= VERIFIED_CACHE_MAXSIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _verified_cache.pop(next(iter(_verified_cache)))
+        _verified_cache[cache_key] = now + ttl
+
+    return True
 
 
 # -------------------------------------------------------------------------
@@ -174,17 +273,37 @@ def decode_token(token: str) -> dict | None:
         >>> payload["sub"]
         'user@example.com'
     """
+    ttl = settings.jwt_cache_ttl
+    if ttl > 0:
+        token_hash = hashlib.sha256(token.encode()).digest()
+        now = time.monotonic()
+        with _decoded_cache_lock:
+            entry = _decoded_cache.get(token_hash)
+        if entry is not None and entry[1] > now:
+            return dict(entry[0])
+
     try:
         payload = jwt.decode(
             token,
             settings.secret_key,
             algorithms=[settings.jwt_algorithm],
         )
-        return payload
     except JWTError as e:
         logger.warning(f"JWT decode error: {e}")
         return None
 
+    if ttl > 0:
+        exp = payload.get("exp")
+        if isinstance(exp, int | float):
+            ttl = min(ttl, exp - time.time())
+        with _decoded_cache_lock:
+            if len(_decoded_cache) >= DECODED_CACHE_MAXSIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                _decoded_cache.pop(next(iter(_decoded_cache)))
+            _decoded_cache[token_hash] = (dict(payload), now + ttl)
+
+    return payload
+
 
 def verify_token_type(token: str, expected_type: str) -> dict | None:
     """
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Warm Alembic Runner
+
+Runs several read-only Alembic commands in one Python process.
+
+Each `alembic ...` shell call starts a new interpreter and re-imports
+SQLAlchemy and the app settings. CI steps that run `alembic current`,
+`alembic heads` and `alembic history` back-to-back pay that startup cost
+every time. This script pays it once and runs every command against the
+same warm interpreter.
+
+Usage:
+    # From project root with venv activated:
+    python scripts/alembic_fast.py current heads history
+
+    # Read commands from stdin, one per line (e.g. from a CI step):
+    printf "current\\nheads\\n" | python scripts/alembic_fast.py
+
+    # Options:
+    python scripts/alembic_fast.py --verbose current history
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+# Add project root to path so alembic/env.py can import the app package
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Read-only commands that are safe to batch
+COMMANDS = {
+    "current": command.current,
+    "heads": command.heads,
+    "history": command.history,
+    "branches": command.branches,
+}
+
+
+def run_commands(names: list[str], verbose: bool = False) -> int:
+    """
+    Run the given Alembic commands against one shared Config.
+
+    Args:
+        names: Command names (keys of COMMANDS)
+        verbose: Pass verbose=True to each command
+
+    Returns:
+        Process exit code (0 on success, 1 on an unknown command)
+    """
+    alembic_cfg = Config(str(project_root / "alembic.ini"))
+
+    for name in names:
+        func = COMMANDS.get(name)
+        if func is None:
+            print(
+                f"Unknown command '{name}'. Choose from: {', '.join(COMMANDS)}",
+                file=sys.stderr,
+            )
+            return 1
+
+        print(f"$ alembic {name}")
+        func(alembic_cfg, verbose=verbose)
+
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run read-only Alembic commands in one warm process"
+    )
+    parser.add_argument(
+        "commands",
+        nargs="*",
+        help="Commands to run (default: read them from stdin, one per line)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show verbose output for each command"
+    )
+
+    args = parser.parse_args()
+
+    names = args.commands or [line.strip() for line in sys.stdin if line.strip()]
+    sys.exit(run_commands(names, verbose=args.verbose))
+
+
+if __name__ == "__main__":
+    main()
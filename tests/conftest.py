@@ -45,11 +45,11 @@ from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, enforce_read_only, get_db, get_db_readonly
 from app.main import app
 from app.models import Author, Book, Genre
 from app.models.review import Review
@@ -88,6 +88,18 @@ def engine():
         poolclass=StaticPool,
     )
 
+    # pysqlite delays BEGIN until the first write, so a SAVEPOINT (from
+    # Session.begin_nested()) could end up outside any transaction and its
+    # RELEASE would commit for real, leaking rows into later tests. Turn
+    # off the driver's own transaction handling and emit BEGIN ourselves.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
 
@@ -117,10 +129,14 @@ def db_session(engine) -> Generator[Session, None, None]:
         bind=engine,
     )
 
-    # Begin a transaction
+    # Begin a transaction. The session runs inside a SAVEPOINT, so its own
+    # commit/rollback (e.g. a failed GraphQL mutation) stays within this
+    # test's transaction instead of discarding the fixtures' rows.
     connection = engine.connect()
     transaction = connection.begin()
-    session = TestSessionLocal(bind=connection)
+    session = TestSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
 
     yield session
 
@@ -131,7 +147,29 @@ def db_session(engine) -> Generator[Session, None, None]:
 
 
 @pytest.fixture(scope="function")
-def client(db_session: Session) -> Generator[TestClient, None, None]:
+def override_get_db_readonly(db_session: Session):
+    """
+    Dependency override for get_db_readonly.
+
+    Like the real dependency, each request gets its own session with
+    enforce_read_only applied, so a write in a read-only route fails in
+    tests too. It shares db_session's connection and sees its data.
+    """
+
+    def override() -> Generator[Session, None, None]:
+        db = enforce_read_only(Session(bind=db_session.connection(), autoflush=False))
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return override
+
+
+@pytest.fixture(scope="function")
+def client(
+    db_session: Session, override_get_db_readonly
+) -> Generator[TestClient, None, None]:
     """
     Create a test client with the test database.
 
@@ -153,6 +191,7 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
 
     # Override the dependency
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_readonly] = override_get_db_readonly
 
     # Create test client
     with TestClient(app) as test_client:
@@ -16,7 +16,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import get_db, get_db_readonly
 from app.main import app
 
 
@@ -24,7 +24,7 @@ class TestAPIKeyAuthentication:
     """Tests for API key authentication on protected endpoints."""
 
     @pytest.fixture
-    def auth_client(self, db_session):
+    def auth_client(self, db_session, override_get_db_readonly):
         """
         Create a test client with API key authentication ENABLED.
 
@@ -47,6 +47,7 @@ class TestAPIKeyAuthentication:
                 pass
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db_readonly
 
         with TestClient(app) as test_client:
             yield test_client, settings.admin_api_key
@@ -160,7 +161,7 @@ class TestAPIKeyManagement:
     """Tests for API key management endpoints."""
 
     @pytest.fixture
-    def admin_client(self, db_session):
+    def admin_client(self, db_session, override_get_db_readonly):
         """Create a test client with admin privileges."""
         settings = get_settings()
         original_enabled = settings.api_key_enabled
@@ -176,6 +177,7 @@ class TestAPIKeyManagement:
                 pass
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db_readonly
 
         with TestClient(app) as test_client:
             yield test_client, settings.admin_api_key
@@ -265,12 +267,44 @@ class TestAPIKeyManagement:
         )
         assert get_response.json()["is_active"] is False
 
+    def test_revoked_key_rejected_after_use(self, admin_client):
+        """Test that a revoked key stops working even after it was cached."""
+        client, admin_key = admin_client
+
+        create_response = client.post(
+            "/api/v1/api-keys/",
+            json={"name": "Cached Key"},
+            headers={"X-API-Key": admin_key},
+        )
+        data = create_response.json()
+        new_key = data["key"]
+
+        # Use the key once so its validation result is cached
+        response = client.post(
+            "/api/v1/authors/",
+            json={"name": "Cached Key Author"},
+            headers={"X-API-Key": new_key},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        client.delete(
+            f"/api/v1/api-keys/{data['id']}",
+            headers={"X-API-Key": admin_key},
+        )
+
+        response = client.post(
+            "/api/v1/authors/",
+            json={"name": "Another Author"},
+            headers={"X-API-Key": new_key},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
 
 class TestAuthWithDisabledAuth:
     """Tests when API key authentication is disabled."""
 
     @pytest.fixture
-    def no_auth_client(self, db_session):
+    def no_auth_client(self, db_session, override_get_db_readonly):
         """Create a test client with API key authentication DISABLED."""
         settings = get_settings()
         original_enabled = settings.api_key_enabled
@@ -285,6 +319,7 @@ class TestAuthWithDisabledAuth:
                 pass
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db_readonly
 
         with TestClient(app) as test_client:
             yield test_client
@@ -308,7 +343,7 @@ class TestAPIKeyHeader:
     """Tests for API key header handling."""
 
     @pytest.fixture
-    def header_client(self, db_session):
+    def header_client(self, db_session, override_get_db_readonly):
         """Create client with auth enabled for header tests."""
         settings = get_settings()
         settings.api_key_enabled = True
@@ -321,6 +356,7 @@ class TestAPIKeyHeader:
                 pass
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db_readonly
 
         with TestClient(app) as test_client:
             yield test_client
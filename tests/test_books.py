@@ -21,6 +21,12 @@ Each test should:
 
 import pytest
 from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app.database import enforce_read_only
+from app.models import Genre
 
 
 class TestListBooks:
@@ -296,3 +302,17 @@ class TestBookValidation:
             assert response.status_code == status.HTTP_201_CREATED
         else:
             assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestReadOnlySession:
+    """Tests for the session behind ReadOnlyDbSession (used by book reads)."""
+
+    def test_read_only_session_rejects_writes(self, db_session, sample_genre):
+        """Test that reads work but a write fails instead of being discarded."""
+        db = enforce_read_only(Session(bind=db_session.connection()))
+
+        assert db.execute(select(Genre.name)).scalar_one() == sample_genre.name
+
+        db.add(Genre(name="Not Saved"))
+        with pytest.raises(InvalidRequestError, match="read-only"):
+            db.flush()
@@ -8,13 +8,19 @@ Tests for the GraphQL endpoint including:
 - Authentication tests
 """
 
+import asyncio
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.graphql.context import GraphQLContext
+from app.graphql.queries import book_to_graphql
 from app.models import Author, Book, Genre
 from app.models.review import Review
 from app.models.user import User
 from app.services.security import create_access_token
+from tests.test_recommendations import create_recommendation_test_data
 
 # =============================================================================
 # Helper Functions
@@ -98,8 +104,49 @@ class TestBooksQuery:
         assert len(result["data"]["books"]["items"]) == 1
         assert result["data"]["books"]["items"][0]["title"] == sample_book.title
         assert len(result["data"]["books"]["items"][0]["authors"]) == 1
+
+    def test_list_books_authors_in_fragment(
+        self, client: TestClient, sample_book: Book, db_session: Session
+    ):
+        """Test that relations selected through a fragment are still loaded."""
+        query = """
+        query {
+            books {
+                items { ...BookAuthors }
+            }
+        }
+
+        fragment BookAuthors on BookType {
+            title
+            authors { name }
+            genres { name }
+        }
+        """
+        result = graphql_query(client, query)
+
+        assert "errors" not in result
+        assert result["data"]["books"]["items"][0]["authors"] == [{"name": "George Orwell"}]
         assert len(result["data"]["books"]["items"][0]["genres"]) == 1
 
+    def test_list_without_relations_then_book_with_relations(
+        self, client: TestClient, sample_book: Book
+    ):
+        """Test that a list skipping relations doesn't blank them for a later field."""
+        query = """
+        query($id: Int!) {
+            books { items { id title } }
+            book(id: $id) {
+                authors { name }
+                genres { name }
+            }
+        }
+        """
+        result = graphql_query(client, query, variables={"id": sample_book.id})
+
+        assert "errors" not in result
+        assert result["data"]["book"]["authors"] == [{"name": "George Orwell"}]
+        assert result["data"]["book"]["genres"] == [{"name": sample_book.genres[0].name}]
+
     def test_list_books_pagination(self, client: TestClient, multiple_books: list[Book]):
         """Test books pagination."""
         query = """
@@ -125,6 +172,36 @@ class TestBooksQuery:
         assert result["data"]["books"]["perPage"] == 5
         assert result["data"]["books"]["pages"] == 3
 
+    def test_list_books_page_past_end(self, client: TestClient, multiple_books: list[Book]):
+        """Test that a page past the end still reports the total."""
+        query = """
+        query {
+            books(page: 10, perPage: 5) {
+                items { id }
+                total
+                pages
+            }
+        }
+        """
+        result = graphql_query(client, query)
+
+        assert "errors" not in result
+        assert result["data"]["books"]["items"] == []
+        assert result["data"]["books"]["total"] == 15
+        assert result["data"]["books"]["pages"] == 3
+
+    def test_book_conversion_shares_authors_per_request(
+        self, db_session: Session, multiple_books: list[Book]
+    ):
+        """Test that an author shared by several books is converted once per request."""
+        context = GraphQLContext(db=db_session)
+        first, second = (
+            book_to_graphql(book, context=context) for book in multiple_books[:4:2]
+        )
+
+        assert first.authors[0] is second.authors[0]
+        assert book_to_graphql(multiple_books[0]).authors[0] is not first.authors[0]
+
     def test_get_single_book(self, client: TestClient, sample_book: Book):
         """Test getting a single book by ID."""
         query = """
@@ -222,6 +299,26 @@ class TestGenresQuery:
         assert result["data"]["genres"]["total"] == 1
         assert result["data"]["genres"]["items"][0]["name"] == sample_genre.name
 
+    def test_list_genres_served_from_cache(
+        self, client: TestClient, sample_genre: Genre, db_session: Session
+    ):
+        """Test that a cached genre page is returned without hitting the database."""
+        store = {}
+        query = "query { genres { items { name } total } }"
+
+        with (
+            patch("app.graphql.queries.cache_get", side_effect=store.get),
+            patch("app.graphql.queries.cache_set", side_effect=lambda k, v, ttl: store.update({k: v})),
+        ):
+            first = graphql_query(client, query)
+            db_session.delete(sample_genre)
+            db_session.commit()
+            second = graphql_query(client, query)
+
+        assert "errors" not in second
+        assert second == first
+        assert second["data"]["genres"]["items"] == [{"name": sample_genre.name}]
+
 
 class TestReviewsQuery:
     """Tests for the reviews query."""
@@ -266,6 +363,135 @@ class TestReviewsQuery:
         assert result["data"]["reviews"]["items"][0]["title"] == "Great book!"
 
 
+class TestSimilarBooksQuery:
+    """Tests for the similarBooks query."""
+
+    def test_similar_books(self, client: TestClient, db_session: Session):
+        """Test that similar books come back with full book data."""
+        genre = Genre(name="Shared Genre")
+        db_session.add(genre)
+        db_session.commit()
+
+        books = [Book(title=f"Similar {i}", genres=[genre]) for i in range(3)]
+        db_session.add_all(books)
+        db_session.commit()
+
+        query = """
+        query SimilarBooks($bookId: Int!) {
+            similarBooks(bookId: $bookId) {
+                book {
+                    id
+                    title
+                    genres { name }
+                }
+                score
+            }
+        }
+        """
+        result = graphql_query(client, query, {"bookId": books[0].id})
+
+        assert "errors" not in result
+        items = result["data"]["similarBooks"]
+        assert {item["book"]["title"] for item in items} == {"Similar 1", "Similar 2"}
+        assert all(item["book"]["genres"] == [{"name": "Shared Genre"}] for item in items)
+        assert all(item["score"] > 0 for item in items)
+
+
+class TestRecommendationsQuery:
+    """Tests for the recommendations query."""
+
+    query = """
+    query {
+        recommendations {
+            book { id }
+            score
+        }
+    }
+    """
+
+    def test_recommendations_cold_start(self, client: TestClient, db_session: Session):
+        """Test that trending books (user has no reviews) come back with scores."""
+        data = create_recommendation_test_data(db_session)
+        token = get_auth_token(data["users"]["new_user"])
+
+        result = graphql_query(client, self.query, token=token)
+
+        assert "errors" not in result
+        items = result["data"]["recommendations"]
+        assert items
+        assert all(item["score"] is not None for item in items)
+
+    def test_recommendations_content_based_fallback(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test that content-based results (no similar users) come back with scores."""
+        data = create_recommendation_test_data(db_session)
+        # Nobody else has reviewed this book, so there are no similar users
+        user = data["users"]["new_user"]
+        book = Book(title="The Silmarillion", authors=[data["authors"]["tolkien"]])
+        db_session.add(book)
+        db_session.flush()
+        db_session.add(Review(book_id=book.id, user_id=user.id, rating=5))
+        db_session.commit()
+        token = get_auth_token(user)
+
+        result = graphql_query(client, self.query, token=token)
+
+        assert "errors" not in result
+        items = result["data"]["recommendations"]
+        assert items
+        assert all(item["score"] is not None for item in items)
+
+
+class TestSearchQuery:
+    """Tests for the search query (PostgreSQL fallback, ES is not available)."""
+
+    def test_search(self, client: TestClient, sample_book: Book):
+        """Test that search runs inside the server's event loop."""
+        query = """
+        query Search($query: String) {
+            search(query: $query) {
+                items { book { id title } }
+                total
+            }
+        }
+        """
+        result = graphql_query(client, query, {"query": sample_book.title})
+
+        assert "errors" not in result
+        assert result["data"]["search"]["total"] == 1
+        assert result["data"]["search"]["items"][0]["book"]["id"] == sample_book.id
+
+    def test_search_fallback_runs_off_event_loop(self, client: TestClient, sample_book: Book):
+        """Test that the PostgreSQL fallback doesn't run on the event loop."""
+        from app.services import search as search_service
+
+        fallback = search_service._search_books_postgres
+        on_loop = []
+
+        def record_thread(**kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return fallback(**kwargs)
+
+        query = """
+        query Search($query: String) {
+            a: search(query: $query) { total }
+            b: search(query: $query) { items { book { title } } }
+        }
+        """
+        with patch.object(search_service, "_search_books_postgres", side_effect=record_thread):
+            result = graphql_query(client, query, {"query": sample_book.title})
+
+        assert "errors" not in result
+        assert result["data"]["a"]["total"] == 1
+        assert result["data"]["b"]["items"][0]["book"]["title"] == sample_book.title
+        assert on_loop == [False, False]
+
+
 class TestMeQuery:
     """Tests for the me query (current user)."""
 
@@ -388,6 +614,26 @@ class TestAuthMutations:
         assert result["data"]["register"]["accessToken"] is not None
         assert result["data"]["register"]["user"]["email"] == "newuser@example.com"
 
+    def test_register_duplicate_email(self, client: TestClient, sample_user: User):
+        """Test registration with an email that is already taken."""
+        query = """
+        mutation($input: RegisterInput!) {
+            register(input: $input) {
+                accessToken
+            }
+        }
+        """
+        variables = {
+            "input": {
+                "email": sample_user.email,
+                "password": "NewPass123",
+            }
+        }
+        result = graphql_query(client, query, variables=variables)
+
+        assert "errors" in result
+        assert result["errors"][0]["message"] == "Email already registered"
+
 
 class TestBookMutations:
     """Tests for book mutations."""
@@ -432,6 +678,32 @@ class TestBookMutations:
         assert len(result["data"]["createBook"]["authors"]) == 1
         assert len(result["data"]["createBook"]["genres"]) == 1
 
+    def test_create_book_duplicate_author_ids(
+        self, client: TestClient, sample_user: User, sample_author: Author
+    ):
+        """Test that a repeated author ID isn't reported as missing."""
+        token = get_auth_token(sample_user)
+
+        query = """
+        mutation($input: BookInput!) {
+            createBook(input: $input) {
+                authors {
+                    id
+                }
+            }
+        }
+        """
+        variables = {
+            "input": {
+                "title": "Duplicate Authors",
+                "authorIds": [sample_author.id, sample_author.id],
+            }
+        }
+        result = graphql_query(client, query, variables=variables, token=token)
+
+        assert "errors" not in result
+        assert result["data"]["createBook"]["authors"] == [{"id": sample_author.id}]
+
     def test_create_book_unauthenticated(self, client: TestClient):
         """Test creating a book without authentication."""
         query = """
@@ -494,6 +766,37 @@ class TestBookMutations:
         assert "errors" not in result
         assert result["data"]["deleteBook"] is True
 
+    def test_cache_invalidated_only_after_commit(
+        self, client: TestClient, sample_user: User, sample_book: Book, db_session: Session
+    ):
+        """Test that cache eviction waits for the commit and is skipped on rollback."""
+        token = get_auth_token(sample_user)
+        in_transaction = []
+
+        with patch(
+            "app.graphql.mutations.invalidate_book_cache",
+            side_effect=lambda *args: in_transaction.append(db_session.in_transaction()),
+        ) as invalidate:
+            # The second delete fails, so the whole operation is rolled back
+            result = graphql_query(
+                client,
+                "mutation($id: Int!) { a: deleteBook(id: $id) b: deleteBook(id: 99999) }",
+                variables={"id": sample_book.id},
+                token=token,
+            )
+            assert "errors" in result
+            invalidate.assert_not_called()
+
+            result = graphql_query(
+                client,
+                "mutation($id: Int!) { deleteBook(id: $id) }",
+                variables={"id": sample_book.id},
+                token=token,
+            )
+
+        assert "errors" not in result
+        assert in_transaction == [False]
+
 
 class TestReviewMutations:
     """Tests for review mutations."""
@@ -548,6 +851,28 @@ class TestReviewMutations:
 
         assert "errors" in result
 
+    def test_create_review_duplicate(
+        self, client: TestClient, sample_user: User, sample_book: Book, db_session: Session
+    ):
+        """Test that a second review of the same book is rejected."""
+        db_session.add(Review(book_id=sample_book.id, user_id=sample_user.id, rating=3))
+        db_session.commit()
+
+        token = get_auth_token(sample_user)
+
+        query = """
+        mutation($bookId: Int!, $input: ReviewInput!) {
+            createReview(bookId: $bookId, input: $input) {
+                id
+            }
+        }
+        """
+        variables = {"bookId": sample_book.id, "input": {"rating": 5}}
+        result = graphql_query(client, query, variables=variables, token=token)
+
+        assert "errors" in result
+        assert "already reviewed" in result["errors"][0]["message"]
+
     def test_update_own_review(
         self, client: TestClient, sample_user: User, sample_book: Book, db_session: Session
     ):
@@ -317,8 +317,14 @@ class TestSimilarBooks:
         assert response.status_code == status.HTTP_200_OK
         result = response.json()
 
-        # Should return results (Hobbit might be excluded since Alice read it)
-        assert "items" in result
+        # Hobbit (same author as LOTR) is excluded since Alice read it
+        similar_ids = [item["book"]["id"] for item in result["items"]]
+        assert data["books"]["hobbit"].id not in similar_ids
+
+        # Anonymous users still get it
+        response = client.get(f"/api/v1/books/{data['books']['lotr'].id}/similar")
+        similar_ids = [item["book"]["id"] for item in response.json()["items"]]
+        assert data["books"]["hobbit"].id in similar_ids
 
 
 # =============================================================================
@@ -119,6 +119,13 @@ class TestBookSearch:
         # Should match "The Old Man...", "The Hobbit", "The Lord..."
         assert data["total"] == 3
 
+    def test_search_by_title_wildcards_are_literal(self, client, search_data):
+        """Test that LIKE wildcards in the search term are matched literally."""
+        response = client.get("/api/v1/books/search", params={"title": "%"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 0
+
     def test_search_by_author(self, client, search_data):
         """Test filtering books by author name."""
         response = client.get("/api/v1/books/search?author=orwell")
@@ -295,6 +302,13 @@ class TestBookListFilters:
         assert data["total"] == 1
         assert data["items"][0]["title"] == "Medium Book"
 
+    def test_list_with_zero_max_price(self, client, filter_data):
+        """Test that max_price=0 is applied as a filter, not ignored."""
+        response = client.get("/api/v1/books/?max_price=0")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 0
+
     def test_list_without_filters(self, client, filter_data):
         """Test listing all books without filters."""
         response = client.get("/api/v1/books/")
@@ -18,8 +18,10 @@ from fastapi import status
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.dependencies import get_current_user
+from app.main import app
 from app.models.user import User
-from app.services.security import create_refresh_token, verify_password
+from app.services.security import create_refresh_token, pwd_context, verify_password
 
 
 class TestUserRegistration:
@@ -292,7 +294,7 @@ class TestPasswordHashing:
     def test_password_stored_as_hash(
         self, client: TestClient, db_session: Session
     ):
-        """Test that password is stored as bcrypt hash, not plain text."""
+        """Test that password is stored as argon2id hash, not plain text."""
         password = "SecurePass123"
         response = client.post(
             "/api/v1/auth/register",
@@ -311,13 +313,36 @@ class TestPasswordHashing:
         assert user is not None
         # Password should NOT be stored as plain text
         assert user.hashed_password != password
-        # Password should be a bcrypt hash (starts with $2b$)
-        assert user.hashed_password.startswith("$2b$")
+        # Password should be an argon2id hash (starts with $argon2id$)
+        assert user.hashed_password.startswith("$argon2id$")
         # Verify the password matches using our security function
         assert verify_password(password, user.hashed_password) is True
         # Wrong password should not match
         assert verify_password("WrongPassword123", user.hashed_password) is False
 
+    def test_bcrypt_hash_upgraded_on_login(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test that a legacy bcrypt hash still works and is re-hashed on login."""
+        password = "SecurePass123"
+        user = User(
+            email="legacy@example.com",
+            username="legacyuser",
+            hashed_password=pwd_context.hash(password, scheme="bcrypt"),
+        )
+        db_session.add(user)
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": "legacy@example.com", "password": password},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        db_session.refresh(user)
+        assert user.hashed_password.startswith("$argon2id$")
+        assert verify_password(password, user.hashed_password) is True
+
 
 # =============================================================================
 # JWT Authentication Tests (Phase 3B)
@@ -479,6 +504,17 @@ class TestGetMe:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_get_me_uses_current_user_override(self, client: TestClient, sample_user: User):
+        """Test that overriding get_current_user also applies to ActiveUser routes."""
+        app.dependency_overrides[get_current_user] = lambda: sample_user
+        try:
+            response = client.get("/api/v1/auth/me")
+        finally:
+            del app.dependency_overrides[get_current_user]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["email"] == sample_user.email
+
 
 class TestTokenRefresh:
     """Tests for token refresh endpoint: POST /api/v1/auth/refresh"""
@@ -659,3 +695,32 @@ class TestTokenSecurity:
         )
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cached_token_still_checks_user(self, client: TestClient, db_session: Session):
+        """Test that a deactivated user is rejected even if their token was seen before."""
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": "cached@example.com",
+                "username": "cacheduser",
+                "password": "SecurePass123",
+            },
+        )
+        login_response = client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": "cached@example.com",
+                "password": "SecurePass123",
+            },
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        user = db_session.query(User).filter_by(email="cached@example.com").first()
+        user.is_active = False
+        db_session.commit()
+
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code != status.HTTP_200_OK